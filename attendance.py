@@ -1,6 +1,10 @@
 import sys
 import os
+import atexit
+import queue
+import re
 import logging
+import logging.handlers
 from pathlib import Path
 
 from config_manager import ConfigManager
@@ -10,21 +14,47 @@ from word_handler import WordHandler
 from web_server import AttendanceWebServer
 from splash_screen import create_splash_screen
 
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]+')
+
+class AsciiLogFilter(logging.Filter):
+    """Drop emojis and other non-ASCII text the console or log file may not encode."""
+    
+    def filter(self, record):
+        text = record.getMessage()
+        if not text.isascii():
+            text = _NON_ASCII_RE.sub('', text)
+        record.msg = text.strip() or "Action completed"
+        record.args = None
+        return True
+
 def setup_logging():
     """Setup logging configuration."""
-    import os
-    from pathlib import Path
     appdata = os.getenv('APPDATA') or os.path.expanduser('~')
     log_dir = Path(appdata) / "AttendanceTracker" / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
-    # Only create log_dir if/when a log file is actually written
+    # delay=True keeps the log file closed until the first record is written
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_dir / 'attendance.log',
+        maxBytes=10 * 1024 * 1024,
+        backupCount=3,
+        delay=True
+    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    ascii_filter = AsciiLogFilter()
+    handlers = [file_handler, logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        handler.addFilter(ascii_filter)
+    
+    # Callers only enqueue records; the listener thread filters and writes them
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_dir / 'attendance.log'),
-            logging.StreamHandler()
-        ]
+        format='%(message)s',
+        handlers=[logging.handlers.QueueHandler(log_queue)]
     )
 
 def main():
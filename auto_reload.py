@@ -1,23 +1,64 @@
 import subprocess
 import sys
+import threading
 import time
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import os
+from pathlib import Path
 
 # Set your main script names here
 WEB_SCRIPT = 'run_web.py'
 DESKTOP_SCRIPT = 'attendance.py'
 
+# Only source files trigger a restart, and never from generated or tool directories
+WATCH_SUFFIXES = ('.py',)
+IGNORE_DIRS = frozenset({'__pycache__', '.git', 'logs', 'filled_docs', 'build', 'dist', '.venv', 'venv'})
+
 class RestartHandler(FileSystemEventHandler):
+    # Quiet period that coalesces the burst of events an editor emits per save
+    DEBOUNCE_DELAY = 0.2
+    # Longest a restart can be held back while events keep arriving
+    MAX_DELAY = 1.0
+
     def __init__(self, restart_callback):
         self.restart_callback = restart_callback
+        self._lock = threading.Lock()
+        self._restart_lock = threading.Lock()
+        self._timer = None
+        self._pending_since = None
+        self._last_changed = None
 
     def on_any_event(self, event):
         if event.is_directory:
             return
-        if event.src_path.endswith('.py'):
-            print(f"Detected change in {event.src_path}, restarting...")
+        if not event.src_path.endswith(WATCH_SUFFIXES):
+            return
+        if not IGNORE_DIRS.isdisjoint(Path(event.src_path).parts):
+            return
+        self._schedule_restart(event.src_path)
+
+    def _schedule_restart(self, path):
+        with self._lock:
+            self._last_changed = path
+            now = time.monotonic()
+            if self._timer:
+                self._timer.cancel()
+            if self._pending_since is None:
+                self._pending_since = now
+            delay = 0 if now - self._pending_since >= self.MAX_DELAY else self.DEBOUNCE_DELAY
+            self._timer = threading.Timer(delay, self._restart)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _restart(self):
+        with self._lock:
+            self._timer = None
+            self._pending_since = None
+            path = self._last_changed
+        print(f"Detected change in {path}, restarting...")
+        # Never let two timers restart the app at the same time
+        with self._restart_lock:
             self.restart_callback()
 
 class AppReloader:
@@ -31,7 +72,8 @@ class AppReloader:
             self.process.terminate()
             self.process.wait()
         print(f"Starting {self.script}...")
-        self.process = subprocess.Popen([sys.executable, self.script])
+        # close_fds=False and no preexec_fn/pass_fds keep subprocess on its posix_spawn fast path
+        self.process = subprocess.Popen([sys.executable, self.script], close_fds=False)
 
     def restart(self):
         self.start_app()
@@ -45,6 +87,7 @@ if __name__ == "__main__":
     # Choose which app to reload: 'web' or 'desktop'
     mode = sys.argv[1] if len(sys.argv) > 1 else 'web'
     script = WEB_SCRIPT if mode == 'web' else DESKTOP_SCRIPT
+    print(f"posix_spawn available: {getattr(subprocess, '_USE_POSIX_SPAWN', False)}")
     reloader = AppReloader(script)
     event_handler = RestartHandler(reloader.restart)
     observer = Observer()
@@ -1,17 +1,37 @@
 """Configuration management module for attendance tracker."""
 
+import atexit
+import copy
 import json
 import os
+import shutil
+import tempfile
+import threading
+import time
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Marks a key that is absent from the config
+_MISSING = object()
+
+
+def _deep_merge(dst: Dict[str, Any], src: Dict[str, Any]) -> None:
+    """Recursively merge src into dst in place."""
+    for key, value in src.items():
+        if isinstance(value, dict) and isinstance(dst.get(key), dict):
+            _deep_merge(dst[key], value)
+        else:
+            dst[key] = value
+
 class ConfigManager:
     """Manages application configuration and settings."""
     
-    DEFAULT_CONFIG = {
+    # Read-only; each instance works on its own deep copy
+    DEFAULT_CONFIG = MappingProxyType({
         "pdf_path": "",
         "document_path": "",  # For Word documents
         "document_type": "pdf",  # "pdf" or "word"
@@ -42,7 +62,10 @@ class ConfigManager:
                 "Month/Year": [100, 650]
             }
         }
-    }
+    })
+    
+    # Minimum delay between two writes triggered by set()
+    FLUSH_INTERVAL = 0.25
     
     def __init__(self, config_file: str = None):
         """Initialize configuration manager.
@@ -50,7 +73,6 @@ class ConfigManager:
         Args:
             config_file: Path to configuration file (optional, defaults to app data dir)
         """
-        import os
         self.app_data_dir = Path(os.getenv('APPDATA') or Path.home() / '.attendance_tracker') / 'AttendanceTracker'
         # Only create app_data_dir if/when a config file is actually written
         if config_file is None:
@@ -58,12 +80,23 @@ class ConfigManager:
         else:
             self.config_file = Path(config_file)
         # Update default paths to be inside app_data_dir
-        self.DEFAULT_CONFIG['output_directory'] = str(self.app_data_dir / 'filled_docs')
-        self.DEFAULT_CONFIG['log_directory'] = str(self.app_data_dir / 'logs')
+        self._defaults = copy.deepcopy(dict(ConfigManager.DEFAULT_CONFIG))
+        self._defaults['output_directory'] = str(self.app_data_dir / 'filled_docs')
+        self._defaults['log_directory'] = str(self.app_data_dir / 'logs')
         if self.config_file.exists():
             self.config = self.load_config()
         else:
-            self.config = self.DEFAULT_CONFIG.copy()
+            self.config = copy.deepcopy(self._defaults)
+        # Resolved get() lookups, keyed on the dotted key
+        self._get_cache = {}
+        # Pending changes not yet written to disk
+        self._dirty = False
+        self._last_flush = 0.0
+        # Writes the changes held back by _maybe_flush once FLUSH_INTERVAL passes
+        self._flush_timer = None
+        # Guards config against the flush timer thread
+        self._lock = threading.RLock()
+        atexit.register(self._flush_at_exit)
     
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create default.
@@ -73,19 +106,33 @@ class ConfigManager:
         """
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    return {**self.DEFAULT_CONFIG, **config}
+                with open(self.config_file, 'rb') as f:
+                    config = json.loads(f.read())
+                # Merge with defaults to ensure all keys exist, including nested ones
+                merged = copy.deepcopy(self._defaults)
+                _deep_merge(merged, config)
+                return merged
             except Exception as e:
                 logger.error(f"Error loading config: {e}")
-                return self.DEFAULT_CONFIG.copy()
+                return copy.deepcopy(self._defaults)
         else:
-            return self.DEFAULT_CONFIG.copy()
+            return copy.deepcopy(self._defaults)
     
     def save_config(self, config: Dict[str, Any] = None) -> bool:
         """Save configuration to file.
         
+        Args:
+            config: Configuration to save (uses current if None)
+            
+        Returns:
+            Success status
+        """
+        with self._lock:
+            return self._save_config(config)
+    
+    def _save_config(self, config: Dict[str, Any] = None) -> bool:
+        """Save configuration to file with the lock held.
+        
         Args:
             config: Configuration to save (uses current if None)
             
@@ -96,9 +143,26 @@ class ConfigManager:
             config = self.config
         try:
             self._ensure_directories()
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4)
+            self.config_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and swap it in so a crash never leaves a partial file
+            # Serialize up front so the file gets a single large write
+            data = json.dumps(config, indent=4).encode('utf-8')
+            fd, tmp_path = tempfile.mkstemp(dir=self.config_file.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb', buffering=1 << 16) as f:
+                    f.write(data)
+                # mkstemp creates the file as 0600; keep the existing file's mode
+                if self.config_file.exists():
+                    shutil.copymode(self.config_file, tmp_path)
+                os.replace(tmp_path, self.config_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            if config is not self.config:
+                self._get_cache.clear()
             self.config = config
+            self._dirty = False
+            self._last_flush = time.monotonic()
             return True
         except Exception as e:
             logger.error(f"Error saving config: {e}")
@@ -114,14 +178,30 @@ class ConfigManager:
         Returns:
             Configuration value
         """
-        keys = key.split('.')
+        try:
+            value = self._get_cache[key]
+        except KeyError:
+            value = self._resolve(key)
+            self._get_cache[key] = value
+        
+        return default if value is _MISSING else value
+    
+    def _resolve(self, key: str) -> Any:
+        """Walk the config tree for a dot notation key.
+        
+        Args:
+            key: Configuration key (supports dot notation)
+            
+        Returns:
+            Configuration value or _MISSING if not found
+        """
         value = self.config
         
-        for k in keys:
+        for k in key.split('.'):
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
-                return default
+                return _MISSING
         
         return value
     
@@ -136,17 +216,61 @@ class ConfigManager:
             Success status
         """
         keys = key.split('.')
-        config = self.config
+        with self._lock:
+            config = self.config
+            
+            # Navigate to parent
+            for k in keys[:-1]:
+                if k not in config:
+                    config[k] = {}
+                config = config[k]
+            
+            # Set value
+            config[keys[-1]] = value
+            self._get_cache.clear()
+            self._dirty = True
+            return self._maybe_flush()
+    
+    def _maybe_flush(self) -> bool:
+        """Write pending changes unless a write happened very recently.
         
-        # Navigate to parent
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
+        A held-back change is written by a timer once FLUSH_INTERVAL has
+        passed, unless a later set() or flush() writes it first.
         
-        # Set value
-        config[keys[-1]] = value
-        return self.save_config()
+        Returns:
+            Success status
+        """
+        if time.monotonic() - self._last_flush < self.FLUSH_INTERVAL:
+            self._schedule_flush()
+            return True
+        return self.flush()
+    
+    def _schedule_flush(self):
+        """Restart the trailing flush timer."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(self.FLUSH_INTERVAL, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+    
+    def flush(self) -> bool:
+        """Write pending changes to file.
+        
+        Returns:
+            Success status
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+            return self._save_config()
+    
+    def _flush_at_exit(self):
+        """Cancel the trailing flush and write pending changes now."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        self.flush()
     
     def _ensure_directories(self):
         """Create necessary directories if they don't exist."""
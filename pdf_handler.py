@@ -1,22 +1,61 @@
 """PDF handling module for attendance sheet processing."""
 
 import os
+import json
+import bisect
+import heapq
+import time
+from collections import defaultdict
+from io import BytesIO
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Dict, Any, Optional, Tuple
 import logging
 
 import PyPDF2
 from PyPDF2 import PdfReader, PdfWriter
-from PyPDF2.generic import NameObject, TextStringObject
+from PyPDF2.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject, TextStringObject
 from reportlab.pdfgen import canvas
+from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 import pdfplumber
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional, fall back to the stdlib parser
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Common names for the month field in attendance PDFs
+_MONTH_ALIASES = ('month', 'Month', 'MONTH', 'month_year', 'Month/Year', 'period', 'Period')
+
+# Style of the attendance report table
+_REPORT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 14),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+# Resource name of the Helvetica font added for text overlays
+_OVERLAY_FONT = 'AttendanceOverlayFont'
+
+
+def _escape_pdf_text(value: str) -> bytes:
+    """Encode text as the body of a PDF literal string."""
+    data = value.encode('cp1252', 'replace')
+    return data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
 class PDFHandler:
     """Handles PDF reading, filling, and generation."""
     
@@ -28,6 +67,29 @@ class PDFHandler:
         """
         self.config = config_manager
         self.last_filled_pdf = None
+        self.font_name = self._register_font()
+        # (pdf_path, form field names) of the last template that was filled
+        self._pdf_field_names = None
+        # Output directory already created by _generate_output_path
+        self._output_dir_ready = None
+    
+    def _register_font(self) -> str:
+        """Register the configured overlay font once.
+        
+        Returns:
+            Font name to use on overlay canvases
+        """
+        font_path = self.config.get('pdf_fallback.font_path')
+        if not font_path:
+            return 'Helvetica'
+        
+        try:
+            font_name = Path(font_path).stem
+            pdfmetrics.registerFont(TTFont(font_name, font_path))
+            return font_name
+        except Exception as e:
+            logger.warning(f"Could not register font {font_path}: {e}")
+            return 'Helvetica'
         
     def fill_attendance_sheet(self, time_in: datetime, time_out: datetime = None) -> Optional[str]:
         """Fill attendance sheet with timestamps.
@@ -41,21 +103,37 @@ class PDFHandler:
         """
         pdf_path = self.config.get('pdf_path')
         
-        if not pdf_path or not os.path.exists(pdf_path):
+        if not pdf_path:
             logger.error(f"PDF not found: {pdf_path}")
             return None
         
         try:
+            # Open the source once; a missing file surfaces here instead of via a stat
+            reader = PdfReader(pdf_path)
+        except (FileNotFoundError, PermissionError) as e:
+            logger.error(f"PDF not found: {pdf_path} ({e})")
+            return None
+        except Exception as e:
+            logger.error(f"Error filling PDF: {e}")
+            return None
+        
+        try:
+            # Scan the template's field names once per template
+            if self._pdf_field_names is None or self._pdf_field_names[0] != pdf_path:
+                has_form = '/AcroForm' in reader.trailer['/Root']
+                fields = (reader.get_form_text_fields() or {}) if has_form else {}
+                self._pdf_field_names = (pdf_path, frozenset(fields))
+            
             # Prepare field values
             field_values = self._prepare_field_values(time_in, time_out)
             
             # Try filling as form first
-            output_path = self._fill_pdf_form(pdf_path, field_values)
+            output_path = self._fill_pdf_form(pdf_path, field_values, reader)
             
             if not output_path and self.config.get('pdf_fallback.enabled', True):
                 # Fallback to overlay method
                 logger.info("Using fallback PDF overlay method")
-                output_path = self._overlay_pdf_text(pdf_path, field_values)
+                output_path = self._overlay_pdf_text(pdf_path, field_values, reader)
             
             if output_path:
                 self.last_filled_pdf = output_path
@@ -98,10 +176,14 @@ class PDFHandler:
         # Selected month field
         selected_month = self.config.get('selected_month')
         if selected_month:
-            # Try common month field names
-            month_field_names = ['month', 'Month', 'MONTH', 'month_year', 'Month/Year', 'period', 'Period']
-            for month_field in month_field_names:
-                values[month_field] = selected_month
+            # Only fill the month aliases the template declares, or all of them if unknown
+            month_fields = _MONTH_ALIASES
+            if self._pdf_field_names:
+                declared = [name for name in _MONTH_ALIASES if name in self._pdf_field_names[1]]
+                if declared:
+                    month_fields = declared
+            for month_field in month_fields:
+                values.setdefault(month_field, selected_month)
         
         # Employee name field (keeping for backward compatibility)
         employee_name = self.config.get('employee_name')
@@ -110,20 +192,21 @@ class PDFHandler:
         
         return values
     
-    def _fill_pdf_form(self, pdf_path: str, field_values: Dict[str, str]) -> Optional[str]:
+    def _fill_pdf_form(self, pdf_path: str, field_values: Dict[str, str], reader: PdfReader = None) -> Optional[str]:
         """Fill PDF form fields.
         
         Args:
             pdf_path: Path to source PDF
             field_values: Dictionary of field names and values
+            reader: Already opened reader for pdf_path (optional)
             
         Returns:
             Path to filled PDF or None on error
         """
         try:
             # Read the PDF
-            reader = PdfReader(pdf_path)
-            writer = PdfWriter()
+            if reader is None:
+                reader = PdfReader(pdf_path)
             
             # Check if PDF has form fields
             if '/AcroForm' not in reader.trailer['/Root']:
@@ -140,8 +223,8 @@ class PDFHandler:
             logger.info(f"Found form fields: {list(fields.keys())}")
             
             # Fill the form
-            for page in reader.pages:
-                writer.add_page(page)
+            writer = PdfWriter()
+            writer.append_pages_from_reader(reader)
             
             # Update form field values
             writer.update_page_form_field_values(
@@ -159,56 +242,39 @@ class PDFHandler:
             return output_path
             
         except Exception as e:
+            # The output directory may have been removed; check again next time
+            self._output_dir_ready = None
             logger.error(f"Error filling PDF form: {e}")
             return None
     
-    def _overlay_pdf_text(self, pdf_path: str, field_values: Dict[str, str]) -> Optional[str]:
-        """Overlay text on PDF using reportlab.
+    def _overlay_pdf_text(self, pdf_path: str, field_values: Dict[str, str], reader: PdfReader = None) -> Optional[str]:
+        """Overlay text on PDF at the configured coordinates.
         
         Args:
             pdf_path: Path to source PDF
             field_values: Dictionary of field names and values
+            reader: Already opened reader for pdf_path (optional)
             
         Returns:
             Path to filled PDF or None on error
         """
         try:
-            from PyPDF2 import PdfMerger
-            from io import BytesIO
-            
             # Read original PDF
-            reader = PdfReader(pdf_path)
+            if reader is None:
+                reader = PdfReader(pdf_path)
             
             # Get coordinates from config
             coordinates = self.config.get('pdf_fallback.coordinates', {})
             
-            # Create overlay PDF
-            packet = BytesIO()
-            can = canvas.Canvas(packet, pagesize=letter)
-            
-            # Add text at specified coordinates
-            for field_name, value in field_values.items():
-                if field_name in coordinates:
-                    x, y = coordinates[field_name]
-                    can.drawString(x, y, value)
-                    logger.debug(f"Added '{value}' at ({x}, {y})")
-            
-            can.save()
-            
-            # Merge PDFs
-            packet.seek(0)
-            overlay = PdfReader(packet)
-            writer = PdfWriter()
-            
-            # Add the overlay to first page
+            # Add the overlay to first page in place, then copy every page at once
             page = reader.pages[0]
-            if len(overlay.pages) > 0:
-                page.merge_page(overlay.pages[0])
-            writer.add_page(page)
-            
-            # Add remaining pages
-            for i in range(1, len(reader.pages)):
-                writer.add_page(reader.pages[i])
+            if self.font_name == 'Helvetica':
+                self._stamp_text(page, field_values, coordinates)
+            else:
+                # Custom TrueType fonts have to be embedded, which needs reportlab
+                self._merge_canvas_overlay(page, field_values, coordinates)
+            writer = PdfWriter()
+            writer.append_pages_from_reader(reader)
             
             # Generate output filename
             output_path = self._generate_output_path(pdf_path)
@@ -220,9 +286,90 @@ class PDFHandler:
             return output_path
             
         except Exception as e:
+            # The output directory may have been removed; check again next time
+            self._output_dir_ready = None
             logger.error(f"Error overlaying PDF text: {e}")
             return None
     
+    def _stamp_text(self, page, field_values: Dict[str, str], coordinates: Dict[str, list]):
+        """Append text drawing operators straight to a page's content stream.
+        
+        Args:
+            page: Page to draw on
+            field_values: Dictionary of field names and values
+            coordinates: Dictionary of field names and [x, y] positions
+        """
+        operations = []
+        for field_name, value in field_values.items():
+            if field_name in coordinates:
+                x, y = coordinates[field_name]
+                operations.append(b"BT /%s 12 Tf %.2f %.2f Td (%s) Tj ET" % (
+                    _OVERLAY_FONT.encode('ascii'), x, y, _escape_pdf_text(value)
+                ))
+                logger.debug(f"Added '{value}' at ({x}, {y})")
+        
+        if not operations:
+            return
+        
+        # Make sure the overlay font is available on the page
+        if '/Resources' in page:
+            resources = page['/Resources'].get_object()
+        else:
+            resources = DictionaryObject()
+            page[NameObject('/Resources')] = resources
+        if '/Font' in resources:
+            fonts = resources['/Font'].get_object()
+        else:
+            fonts = DictionaryObject()
+            resources[NameObject('/Font')] = fonts
+        if '/' + _OVERLAY_FONT not in fonts:
+            fonts[NameObject('/' + _OVERLAY_FONT)] = DictionaryObject({
+                NameObject('/Type'): NameObject('/Font'),
+                NameObject('/Subtype'): NameObject('/Type1'),
+                NameObject('/BaseFont'): NameObject('/Helvetica'),
+                NameObject('/Encoding'): NameObject('/WinAnsiEncoding'),
+            })
+        
+        # Keep the original drawing state isolated from the overlay, like merge_page does
+        contents = page.get_contents()
+        if contents is None:
+            original = b""
+        elif isinstance(contents, ArrayObject):
+            original = b"\n".join(part.get_object().get_data() for part in contents)
+        else:
+            original = contents.get_data()
+        
+        stream = DecodedStreamObject()
+        stream.set_data(b"q\n" + original + b"\nQ\n" + b"\n".join(operations) + b"\n")
+        page[NameObject('/Contents')] = stream
+    
+    def _merge_canvas_overlay(self, page, field_values: Dict[str, str], coordinates: Dict[str, list]):
+        """Draw the overlay with reportlab and merge it into a page.
+        
+        Args:
+            page: Page to draw on
+            field_values: Dictionary of field names and values
+            coordinates: Dictionary of field names and [x, y] positions
+        """
+        packet = BytesIO()
+        can = canvas.Canvas(packet, pagesize=letter)
+        can.setFont(self.font_name, 12)
+        
+        # Add text at specified coordinates
+        for field_name, value in field_values.items():
+            if field_name in coordinates:
+                x, y = coordinates[field_name]
+                can.drawString(x, y, value)
+                logger.debug(f"Added '{value}' at ({x}, {y})")
+        
+        can.save()
+        
+        # Merge PDFs
+        packet.seek(0)
+        overlay = PdfReader(packet)
+        if len(overlay.pages) > 0:
+            page.merge_page(overlay.pages[0])
+    
     def _generate_output_path(self, source_path: str) -> str:
         """Generate output path for filled PDF.
         
@@ -232,17 +379,17 @@ class PDFHandler:
         Returns:
             Output path for filled PDF
         """
-        output_dir = Path(self.config.get('output_directory', 'filled_pdfs'))
-        # Only create output_dir if/when a file is actually written
-        if not output_dir.exists():
-            output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = self.config.get('output_directory', 'filled_pdfs')
+        # Only create output_dir if/when a file is actually written, once per directory
+        if output_dir != self._output_dir_ready:
+            os.makedirs(output_dir, exist_ok=True)
+            self._output_dir_ready = output_dir
         
         # Generate filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        source_name = Path(source_path).stem
-        output_name = f"{source_name}_filled_{timestamp}.pdf"
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        source_name = os.path.splitext(os.path.basename(source_path))[0]
         
-        return str(output_dir / output_name)
+        return os.path.join(output_dir, f"{source_name}_filled_{timestamp}.pdf")
     
     def generate_report_pdf(self, start_date: datetime, end_date: datetime) -> Optional[str]:
         """Generate attendance report PDF.
@@ -255,12 +402,6 @@ class PDFHandler:
             Path to generated report or None on error
         """
         try:
-            from reportlab.lib import colors
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-            from reportlab.lib.styles import getSampleStyleSheet
-            from reportlab.lib.units import inch
-            
             # Load event logs
             events = self._load_events_for_period(start_date, end_date)
             
@@ -293,32 +434,25 @@ class PDFHandler:
             
             # Create table data
             data = [['Date', 'Time In', 'Time Out', 'Duration']]
+            logouts_by_date = self._index_logouts(events)
             
             for event in events:
                 if event['type'] == 'login':
                     # Find corresponding logout
-                    logout = self._find_logout_for_login(event, events)
+                    logout = self._find_logout_for_login(event, logouts_by_date)
                     
+                    login_time = event['timestamp']
                     row = [
-                        event['date'],
-                        event['time'],
-                        logout['time'] if logout else 'N/A',
+                        f"{login_time:%Y-%m-%d}",
+                        f"{login_time:%H:%M:%S}",
+                        f"{logout['timestamp']:%H:%M:%S}" if logout else 'N/A',
                         self._calculate_duration(event, logout) if logout else 'N/A'
                     ]
                     data.append(row)
             
-            # Create table
-            table = Table(data)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            # Create table, repeating the header on every page
+            table = LongTable(data, repeatRows=1)
+            table.setStyle(_REPORT_TABLE_STYLE)
             
             elements.append(table)
             
@@ -342,53 +476,85 @@ class PDFHandler:
         Returns:
             List of events
         """
-        events = []
+        day_lists = []
         log_dir = Path(self.config.get('log_directory', 'logs'))
         
-        # Iterate through date range
-        current_date = start_date
-        while current_date <= end_date:
-            log_file = log_dir / f"events_{current_date.strftime('%Y%m%d')}.json"
-            
-            if log_file.exists():
-                try:
-                    import json
-                    with open(log_file, 'r') as f:
-                        day_events = json.load(f)
-                        
-                        for event in day_events:
-                            event_time = datetime.fromisoformat(event['timestamp'])
-                            events.append({
-                                'type': event['type'],
-                                'date': event_time.strftime('%Y-%m-%d'),
-                                'time': event_time.strftime('%H:%M:%S'),
-                                'timestamp': event_time
-                            })
-                except Exception as e:
-                    logger.error(f"Error loading events from {log_file}: {e}")
-            
-            current_date = current_date.replace(day=current_date.day + 1)
-        
-        return sorted(events, key=lambda x: x['timestamp'])
+        # List the directory once instead of probing every day in the range
+        try:
+            with os.scandir(log_dir) as entries:
+                existing = {
+                    entry.name for entry in entries
+                    if entry.name.startswith('events_') and entry.name.endswith('.json')
+                }
+        except FileNotFoundError:
+            return []
+        
+        # One log file per day in the range that actually exists
+        log_files = []
+        for i in range((end_date - start_date).days + 1):
+            file_name = f"events_{(start_date + timedelta(days=i)).strftime('%Y%m%d')}.json"
+            if file_name in existing:
+                log_files.append(log_dir / file_name)
+        
+        for log_file in log_files:
+            try:
+                # Read the whole day file at once before parsing
+                with open(log_file, 'rb', buffering=1 << 20) as f:
+                    day_events = _json_loads(f.read())
+                
+                events = []
+                for event in day_events:
+                    # Display strings are formatted by the report, only for rows it keeps
+                    events.append({
+                        'type': event['type'],
+                        'timestamp': datetime.fromisoformat(event['timestamp'])
+                    })
+                events.sort(key=lambda x: x['timestamp'])
+                day_lists.append(events)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.error(f"Error loading events from {log_file}: {e}")
+        
+        # Each day is already ordered, so a k-way merge is enough
+        return list(heapq.merge(*day_lists, key=lambda x: x['timestamp']))
     
-    def _find_logout_for_login(self, login_event: dict, all_events: list) -> Optional[dict]:
+    def _index_logouts(self, events: list) -> Dict[date, Tuple[list, list]]:
+        """Group logout events by date for bisect lookups.
+        
+        Args:
+            events: Events sorted by timestamp
+            
+        Returns:
+            Dictionary mapping dates to (timestamps, events) lists
+        """
+        logouts_by_date = defaultdict(lambda: ([], []))
+        for event in events:
+            if event['type'] == 'logout':
+                timestamps, logouts = logouts_by_date[event['timestamp'].date()]
+                timestamps.append(event['timestamp'])
+                logouts.append(event)
+        return dict(logouts_by_date)
+    
+    def _find_logout_for_login(self, login_event: dict, logouts_by_date: Dict[date, Tuple[list, list]]) -> Optional[dict]:
         """Find corresponding logout for a login event.
         
         Args:
             login_event: Login event
-            all_events: All events
+            logouts_by_date: Logout index from _index_logouts
             
         Returns:
             Logout event or None
         """
-        login_time = login_event['timestamp']
+        day_logouts = logouts_by_date.get(login_event['timestamp'].date())
+        if not day_logouts:
+            return None
         
-        for event in all_events:
-            if event['type'] == 'logout' and event['timestamp'] > login_time:
-                # Check if this is the same day
-                if event['date'] == login_event['date']:
-                    return event
-                break
+        # First logout strictly after the login on the same day
+        timestamps, logouts = day_logouts
+        index = bisect.bisect_right(timestamps, login_event['timestamp'])
+        if index < len(logouts):
+            return logouts[index]
         
         return None
     
@@ -403,7 +569,7 @@ class PDFHandler:
             Duration string
         """
         duration = logout_event['timestamp'] - login_event['timestamp']
-        hours = int(duration.total_seconds() // 3600)
-        minutes = int((duration.total_seconds() % 3600) // 60)
+        total_minutes = duration.days * 1440 + duration.seconds // 60
+        hours, minutes = divmod(total_minutes, 60)
         
         return f"{hours:02d}:{minutes:02d}"
\ No newline at end of file
@@ -2,59 +2,281 @@
 
 import sys
 import os
+import calendar
+import shutil
+import traceback
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 import logging
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QGridLayout, QLabel, QPushButton, QTextEdit, QComboBox, QLineEdit,
+    QGridLayout, QLabel, QPushButton, QPlainTextEdit, QComboBox, QLineEdit,
     QFrame, QScrollArea, QGroupBox, QRadioButton, QButtonGroup,
     QFileDialog, QMessageBox,
     QProgressBar, QTabWidget, QSplitter, QStatusBar, QDialog,
     QListWidget, QListWidgetItem
 )
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve
+from PyQt5.QtCore import (
+    Qt, QEvent, QObject, QRunnable, QThreadPool, QTimer, QThread, pyqtSignal, pyqtSlot,
+    QPropertyAnimation, QEasingCurve, QUrl
+)
 from PyQt5.QtGui import (
     QFont, QIcon, QPalette, QColor, QLinearGradient, QPainter, 
-    QBrush, QPen, QPixmap, QFontDatabase
+    QBrush, QPen, QPixmap, QFontDatabase, QDesktopServices
 )
 
 logger = logging.getLogger(__name__)
 
+# Emoji glyphs rendered once into shared icons by _init_icons()
+ICON_GLYPHS = {
+    'browse': "📂",
+    'checkin': "🟢",
+    'checkout': "🔴",
+    'download': "💾",
+    'clear': "🗑️",
+    'open': "📂",
+    'save': "💾",
+    'folder': "📁",
+    'cancel': "❌",
+    'pdf': "📄",
+    'word': "📝",
+}
+ICONS = {}
+
+# Lines kept in the activity log; older lines are dropped
+LOG_MAX_LINES = 5000
+# Delay before queued log lines are appended to the activity log
+LOG_FLUSH_INTERVAL_MS = 100
+
+# Filled document types listed in the download dialog
+DOCUMENT_SUFFIXES = ('.pdf', '.docx', '.doc')
+# (label, icon key) shown for each document suffix
+TYPE_BY_SUFFIX = {
+    '.pdf': ("PDF", 'pdf'),
+    '.docx': ("Word", 'word'),
+    '.doc': ("Word", 'word'),
+}
+
+# Month names and the "Month Year" choices for last, current and next year
+_MONTH_NAMES = tuple(calendar.month_name[month] for month in range(1, 13))
+_CURRENT_YEAR = datetime.now().year
+MONTH_CHOICES = tuple(
+    f"{month_name} {year}"
+    for year in (_CURRENT_YEAR - 1, _CURRENT_YEAR, _CURRENT_YEAR + 1)
+    for month_name in _MONTH_NAMES
+)
+
+def _init_icons(size=32):
+    """Render the emoji icons once; needs a running QApplication."""
+    if ICONS:
+        return
+    font = QFont()
+    font.setPixelSize(int(size * 0.8))
+    for key, glyph in ICON_GLYPHS.items():
+        pixmap = QPixmap(size, size)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setFont(font)
+        painter.drawText(pixmap.rect(), Qt.AlignCenter, glyph)
+        painter.end()
+        ICONS[key] = QIcon(pixmap)
+
+# Application-wide stylesheet; widgets pick their rules by objectName
+# or dynamic property instead of carrying a stylesheet of their own
+APP_STYLESHEET = """
+    QMainWindow {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 #f8f9fa, stop:1 #e9ecef);
+    }
+    QScrollArea {
+        background: transparent;
+        border: none;
+    }
+    QSplitter::handle {
+        background-color: #dee2e6;
+        width: 2px;
+    }
+    QSplitter::handle:hover {
+        background-color: #007bff;
+    }
+    
+    QPushButton[variant] {
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 12px 24px;
+        font-size: 14px;
+        font-weight: bold;
+        font-family: 'Segoe UI', Arial, sans-serif;
+    }
+    QPushButton[variant="primary"] { background-color: #007bff; }
+    QPushButton[variant="primary"]:hover, QPushButton[variant="primary"]:pressed { background-color: #0056b3; }
+    QPushButton[variant="success"] { background-color: #28a745; }
+    QPushButton[variant="success"]:hover, QPushButton[variant="success"]:pressed { background-color: #1e7e34; }
+    QPushButton[variant="info"] { background-color: #17a2b8; }
+    QPushButton[variant="info"]:hover, QPushButton[variant="info"]:pressed { background-color: #138496; }
+    QPushButton[variant="warning"] { background-color: #ffc107; }
+    QPushButton[variant="warning"]:hover, QPushButton[variant="warning"]:pressed { background-color: #e0a800; }
+    QPushButton[variant="purple"] { background-color: #6f42c1; }
+    QPushButton[variant="purple"]:hover, QPushButton[variant="purple"]:pressed { background-color: #5a2d91; }
+    QPushButton[variant="secondary"] { background-color: #6c757d; }
+    QPushButton[variant="secondary"]:hover, QPushButton[variant="secondary"]:pressed { background-color: #5a6268; }
+    QPushButton[variant]:disabled {
+        background-color: #6c757d;
+        color: #adb5bd;
+    }
+    
+    #card, #card QFrame {
+        background-color: white;
+        border-radius: 12px;
+        border: 1px solid #e9ecef;
+        margin: 5px;
+    }
+    QLabel#card_title {
+        font-size: 18px;
+        font-weight: bold;
+        color: #2c3e50;
+        margin-bottom: 10px;
+        border: none;
+    }
+    
+    QRadioButton {
+        font-size: 14px;
+        color: #495057;
+        spacing: 10px;
+        padding: 8px;
+    }
+    QRadioButton::indicator {
+        width: 18px;
+        height: 18px;
+        border-radius: 9px;
+        border: 2px solid #007bff;
+        background-color: white;
+    }
+    QRadioButton::indicator:checked {
+        background-color: #007bff;
+        border: 2px solid #007bff;
+    }
+    QRadioButton::indicator:hover {
+        border: 2px solid #0056b3;
+    }
+    
+    QGroupBox#doc_type_group {
+        font-weight: bold;
+        border: 2px solid #dee2e6;
+        border-radius: 8px;
+        margin-top: 10px;
+        padding-top: 10px;
+    }
+    QGroupBox#doc_type_group::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+    }
+    QLineEdit#path_input, QComboBox#month_combo {
+        padding: 12px;
+        border: 2px solid #dee2e6;
+        border-radius: 8px;
+        font-size: 14px;
+        background-color: white;
+    }
+    QLineEdit#path_input:focus, QComboBox#month_combo:focus {
+        border-color: #007bff;
+    }
+    QComboBox#month_combo::drop-down {
+        border: none;
+        width: 30px;
+    }
+    QComboBox#month_combo::down-arrow {
+        image: none;
+        border-left: 5px solid transparent;
+        border-right: 5px solid transparent;
+        border-top: 5px solid #007bff;
+    }
+    QLabel#month_label {
+        font-weight: bold;
+        color: #495057;
+    }
+    
+    QLabel#time_label {
+        font-size: 24px;
+        font-weight: bold;
+        color: #007bff;
+        text-align: center;
+        padding: 15px;
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 #f8f9fa, stop:1 #e9ecef);
+        border-radius: 8px;
+        border: none;
+    }
+    QLabel#status_label {
+        font-size: 16px;
+        font-weight: bold;
+        padding: 10px;
+        background-color: #f8d7da;
+        color: #721c24;
+        border-radius: 8px;
+        border: none;
+    }
+    QLabel#status_label[state="active"] {
+        background-color: #d4edda;
+        color: #155724;
+    }
+    QLabel#mobile_info {
+        background-color: #e3f2fd;
+        border: 1px solid #2196f3;
+        border-radius: 6px;
+        padding: 8px;
+        color: #0d47a1;
+        font-size: 12px;
+        margin: 5px 0;
+    }
+    QPlainTextEdit#log_text {
+        background-color: #f8f9fa;
+        border: 2px solid #dee2e6;
+        border-radius: 8px;
+        font-family: 'Consolas', 'Courier New', monospace;
+        font-size: 12px;
+        padding: 10px;
+        color: #495057;
+    }
+    
+    QLabel#dialog_title {
+        font-size: 16px;
+        font-weight: bold;
+        color: #2c3e50;
+    }
+    QListWidget#doc_list {
+        border: 2px solid #dee2e6;
+        border-radius: 8px;
+        background-color: white;
+        font-size: 14px;
+        padding: 5px;
+    }
+    QListWidget#doc_list::item {
+        padding: 10px;
+        border-bottom: 1px solid #e9ecef;
+    }
+    QListWidget#doc_list::item:selected {
+        background-color: #007bff;
+        color: white;
+    }
+    QListWidget#doc_list::item:hover {
+        background-color: #f8f9fa;
+    }
+"""
+
 class ModernButton(QPushButton):
     """Custom modern button with hover effects."""
     
-    def __init__(self, text, color="#007bff", hover_color="#0056b3", parent=None):
+    def __init__(self, text, variant="primary", parent=None, icon_key=None):
         super().__init__(text, parent)
-        self.color = color
-        self.hover_color = hover_color
-        self.setup_style()
-    
-    def setup_style(self):
-        """Setup modern button styling."""
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {self.color};
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 14px;
-                font-weight: bold;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }}
-            QPushButton:hover {{
-                background-color: {self.hover_color};
-            }}
-            QPushButton:pressed {{
-                background-color: {self.hover_color};
-            }}
-            QPushButton:disabled {{
-                background-color: #6c757d;
-                color: #adb5bd;
-            }}
-        """)
+        # Colors come from the QPushButton[variant=...] rules in APP_STYLESHEET
+        self.setProperty("variant", variant)
+        if icon_key:
+            self.setIcon(ICONS[icon_key])
         self.setMinimumHeight(45)
 
 class ModernCard(QFrame):
@@ -62,15 +284,8 @@ class ModernCard(QFrame):
     
     def __init__(self, title="", parent=None):
         super().__init__(parent)
+        self.setObjectName("card")
         self.setFrameStyle(QFrame.NoFrame)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 12px;
-                border: 1px solid #e9ecef;
-                margin: 5px;
-            }
-        """)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -78,44 +293,51 @@ class ModernCard(QFrame):
         
         if title:
             title_label = QLabel(title)
-            title_label.setStyleSheet("""
-                QLabel {
-                    font-size: 18px;
-                    font-weight: bold;
-                    color: #2c3e50;
-                    margin-bottom: 10px;
-                    border: none;
-                }
-            """)
+            title_label.setObjectName("card_title")
             layout.addWidget(title_label)
 
 class ModernRadioButton(QRadioButton):
     """Custom modern radio button."""
+
+class QtLogHandler(logging.Handler):
+    """Forward log records to the window's activity log."""
     
-    def __init__(self, text, parent=None):
-        super().__init__(text, parent)
-        self.setStyleSheet("""
-            QRadioButton {
-                font-size: 14px;
-                color: #495057;
-                spacing: 10px;
-                padding: 8px;
-            }
-            QRadioButton::indicator {
-                width: 18px;
-                height: 18px;
-                border-radius: 9px;
-                border: 2px solid #007bff;
-                background-color: white;
-            }
-            QRadioButton::indicator:checked {
-                background-color: #007bff;
-                border: 2px solid #007bff;
-            }
-            QRadioButton::indicator:hover {
-                border: 2px solid #0056b3;
-            }
-        """)
+    def __init__(self, sink, level=logging.INFO):
+        super().__init__(level)
+        self.sink = sink
+    
+    def emit(self, record):
+        """Pass one timestamped line to the sink."""
+        try:
+            timestamp = datetime.fromtimestamp(record.created).strftime("%H:%M:%S")
+            self.sink(f"[{timestamp}] {record.getMessage()}")
+        except Exception:
+            self.handleError(record)
+
+class FileTaskSignals(QObject):
+    """Signals reported back to the GUI thread by a FileTask."""
+    
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+class FileTask(QRunnable):
+    """Run a blocking file operation on the global thread pool."""
+    
+    def __init__(self, func, *args, result=""):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.result = result
+        self.signals = FileTaskSignals()
+    
+    def run(self):
+        """Run the operation and report the outcome."""
+        try:
+            self.func(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(self.result)
 
 class AttendancePyQtGUI(QMainWindow):
     """Modern PyQt-based attendance tracker GUI."""
@@ -127,12 +349,42 @@ class AttendancePyQtGUI(QMainWindow):
         self.word_handler = word_handler
         self.web_server = web_server
         self.last_checkin_time = None
+        # Widgets that handlers may touch before setup_ui has created them
+        self.log_text = None
+        self.path_input = None
+        # Log lines waiting for the next _flush_log
+        self._log_buffer = deque(maxlen=LOG_MAX_LINES)
+        # Lines arriving within LOG_FLUSH_INTERVAL_MS are written together
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_timer.timeout.connect(self._flush_log)
+        # Text currently shown by the clock label
+        self._last_time_text = None
+        # ((output_dir, dir mtime), sorted (mtime, path) pairs) from the last scan
+        self._doc_cache = None
+        # Document selection dialog, built on first use
+        self._download_dialog = None
+        self._doc_list = None
+        # File dialogs, created on first use and kept for later calls
+        self._open_dialog = None
+        self._save_dialog = None
+        # FileTasks still running, kept alive until they report back
+        self._file_tasks = set()
+        # INFO and above from this module are shown in the activity log
+        self._log_handler = QtLogHandler(self._queue_log_line)
+        logger.addHandler(self._log_handler)
+        if not logger.isEnabledFor(logging.INFO):
+            # The activity log needs INFO records even without logging configured
+            logger.setLevel(logging.INFO)
+        _init_icons()
+        # Install the stylesheet before building widgets so each is polished once
+        self.apply_modern_theme()
         # Setup UI
         self.setup_ui()
         self.setup_timers()
         if self.web_server:
             self.start_web_server()
-        self.apply_modern_theme()
         
     def setup_ui(self):
         """Setup the main user interface."""
@@ -143,6 +395,8 @@ class AttendancePyQtGUI(QMainWindow):
         # Central widget with splitter
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
+        # Paint once after the whole widget tree is built
+        central_widget.setUpdatesEnabled(False)
         
         main_layout = QHBoxLayout(central_widget)
         main_layout.setContentsMargins(10, 10, 10, 10)
@@ -159,6 +413,7 @@ class AttendancePyQtGUI(QMainWindow):
         left_scroll.setMinimumWidth(400)
         
         left_widget = QWidget()
+        left_widget.setUpdatesEnabled(False)
         left_layout = QVBoxLayout(left_widget)
         left_layout.setSpacing(15)
         
@@ -167,6 +422,7 @@ class AttendancePyQtGUI(QMainWindow):
         self.create_status_section(left_layout)
         self.create_controls_section(left_layout)
         
+        left_widget.setUpdatesEnabled(True)
         left_scroll.setWidget(left_widget)
         splitter.addWidget(left_scroll)
         
@@ -175,12 +431,20 @@ class AttendancePyQtGUI(QMainWindow):
         
         # Set splitter proportions
         splitter.setSizes([400, 600])
+        central_widget.setUpdatesEnabled(True)
         
         # Status bar
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Ready")
         
+        # Busy indicator for file operations running in the background
+        self.file_progress = QProgressBar()
+        self.file_progress.setRange(0, 0)
+        self.file_progress.setMaximumWidth(150)
+        self.file_progress.hide()
+        self.status_bar.addPermanentWidget(self.file_progress)
+        
     def create_config_section(self, layout):
         """Create configuration section."""
         config_card = ModernCard("📁 Configuration")
@@ -188,20 +452,7 @@ class AttendancePyQtGUI(QMainWindow):
         
         # Document type selection
         doc_type_group = QGroupBox("Document Type")
-        doc_type_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
+        doc_type_group.setObjectName("doc_type_group")
         
         doc_type_layout = QHBoxLayout(doc_type_group)
         
@@ -221,20 +472,9 @@ class AttendancePyQtGUI(QMainWindow):
         path_layout = QHBoxLayout()
         self.path_input = QLineEdit()
         self.path_input.setPlaceholderText("Select document file...")
-        self.path_input.setStyleSheet("""
-            QLineEdit {
-                padding: 12px;
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                font-size: 14px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #007bff;
-            }
-        """)
-        
-        browse_btn = ModernButton("📂 Browse", "#28a745", "#1e7e34")
+        self.path_input.setObjectName("path_input")
+        
+        browse_btn = ModernButton("Browse", "success", icon_key='browse')
         browse_btn.clicked.connect(self.browse_file)
         
         path_layout.addWidget(self.path_input, 3)
@@ -253,31 +493,10 @@ class AttendancePyQtGUI(QMainWindow):
         # Month selection
         month_layout = QHBoxLayout()
         month_label = QLabel("📅 Month:")
-        month_label.setStyleSheet("font-weight: bold; color: #495057;")
+        month_label.setObjectName("month_label")
         
         self.month_combo = QComboBox()
-        self.month_combo.setStyleSheet("""
-            QComboBox {
-                padding: 12px;
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                font-size: 14px;
-                background-color: white;
-            }
-            QComboBox:focus {
-                border-color: #007bff;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 30px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #007bff;
-            }
-        """)
+        self.month_combo.setObjectName("month_combo")
         
         # Populate months
         self.populate_months()
@@ -299,35 +518,13 @@ class AttendancePyQtGUI(QMainWindow):
         
         # Current time display
         self.time_label = QLabel()
-        self.time_label.setStyleSheet("""
-            QLabel {
-                font-size: 24px;
-                font-weight: bold;
-                color: #007bff;
-                text-align: center;
-                padding: 15px;
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 #f8f9fa, stop:1 #e9ecef);
-                border-radius: 8px;
-                border: none;
-            }
-        """)
+        self.time_label.setObjectName("time_label")
         self.time_label.setAlignment(Qt.AlignCenter)
         status_layout.addWidget(self.time_label)
         
         # Monitoring status
         self.status_label = QLabel("⏹️ Monitoring: Stopped")
-        self.status_label.setStyleSheet("""
-            QLabel {
-                font-size: 16px;
-                font-weight: bold;
-                padding: 10px;
-                background-color: #f8d7da;
-                color: #721c24;
-                border-radius: 8px;
-                border: none;
-            }
-        """)
+        self.status_label.setObjectName("status_label")
         self.status_label.setAlignment(Qt.AlignCenter)
         status_layout.addWidget(self.status_label)
         
@@ -344,8 +541,8 @@ class AttendancePyQtGUI(QMainWindow):
         
         # Manual actions
         manual_layout = QHBoxLayout()
-        checkin_btn = ModernButton("🟢 Manual Check-in", "#17a2b8", "#138496")
-        checkout_btn = ModernButton("🔴 Manual Check-out", "#ffc107", "#e0a800")
+        checkin_btn = ModernButton("Manual Check-in", "info", icon_key='checkin')
+        checkout_btn = ModernButton("Manual Check-out", "warning", icon_key='checkout')
         
         checkin_btn.clicked.connect(self.manual_checkin)
         checkout_btn.clicked.connect(self.manual_checkout)
@@ -355,24 +552,14 @@ class AttendancePyQtGUI(QMainWindow):
         controls_layout.addLayout(manual_layout)
         
         # Download button
-        download_btn = ModernButton("💾 Download Filled Document", "#6f42c1", "#5a2d91")
+        download_btn = ModernButton("Download Filled Document", "purple", icon_key='download')
         download_btn.clicked.connect(self.download_document)
         controls_layout.addWidget(download_btn)
         
         # Mobile access info (if web server is enabled)
         if self.web_server:
             mobile_info = QLabel()
-            mobile_info.setStyleSheet("""
-                QLabel {
-                    background-color: #e3f2fd;
-                    border: 1px solid #2196f3;
-                    border-radius: 6px;
-                    padding: 8px;
-                    color: #0d47a1;
-                    font-size: 12px;
-                    margin: 5px 0;
-                }
-            """)
+            mobile_info.setObjectName("mobile_info")
             mobile_info.setWordWrap(True)
             mobile_info.setText("📱 Mobile access enabled! Check console for iPhone setup instructions.")
             controls_layout.addWidget(mobile_info)
@@ -388,23 +575,14 @@ class AttendancePyQtGUI(QMainWindow):
         log_card = ModernCard("📝 Activity Log")
         
         # Clear button
-        clear_btn = ModernButton("🗑️ Clear Log", "#6c757d", "#5a6268")
+        clear_btn = ModernButton("Clear Log", "secondary", icon_key='clear')
         clear_btn.clicked.connect(self.clear_log)
         log_card.layout().addWidget(clear_btn)
         
-        # Log text area
-        self.log_text = QTextEdit()
-        self.log_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #f8f9fa;
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                font-family: 'Consolas', 'Courier New', monospace;
-                font-size: 12px;
-                padding: 10px;
-                color: #495057;
-            }
-        """)
+        # Log text area, bounded so the oldest lines are dropped
+        self.log_text = QPlainTextEdit()
+        self.log_text.setMaximumBlockCount(LOG_MAX_LINES)
+        self.log_text.setObjectName("log_text")
         self.log_text.setReadOnly(True)
         log_card.layout().addWidget(self.log_text)
         
@@ -412,23 +590,9 @@ class AttendancePyQtGUI(QMainWindow):
         
     def apply_modern_theme(self):
         """Apply modern theme to the application."""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 #f8f9fa, stop:1 #e9ecef);
-            }
-            QScrollArea {
-                background: transparent;
-                border: none;
-            }
-            QSplitter::handle {
-                background-color: #dee2e6;
-                width: 2px;
-            }
-            QSplitter::handle:hover {
-                background-color: #007bff;
-            }
-        """)
+        app = QApplication.instance()
+        if app.styleSheet() != APP_STYLESHEET:
+            app.setStyleSheet(APP_STYLESHEET)
         
     # Tray functionality removed
             
@@ -442,26 +606,36 @@ class AttendancePyQtGUI(QMainWindow):
         # Initial time update
         self.update_time()
         
+    @pyqtSlot()
     def update_time(self):
         """Update the time display."""
-        current_time = datetime.now().strftime("%H:%M:%S")
-        current_date = datetime.now().strftime("%A, %B %d, %Y")
-        self.time_label.setText(f"{current_time}\n{current_date}")
+        # Nothing to repaint while the window is hidden or minimized
+        if not self.isVisible() or self.isMinimized():
+            return
+        
+        now = datetime.now()
+        time_text = f"{now:%H:%M:%S}\n{now:%A, %B %d, %Y}"
+        if time_text != self._last_time_text:
+            self._last_time_text = time_text
+            self.time_label.setText(time_text)
+        
+    def showEvent(self, event):
+        """Refresh the clock and pending log lines once the window is visible."""
+        super().showEvent(event)
+        self.update_time()
+        self._flush_log()
+        
+    def changeEvent(self, event):
+        """Refresh the clock when the window is restored from minimized."""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.update_time()
         
     def populate_months(self):
         """Populate month dropdown."""
-        import calendar
-        from datetime import datetime
-        
-        current_year = datetime.now().year
-        months = []
-        
-        for year in [current_year - 1, current_year, current_year + 1]:
-            for month in range(1, 13):
-                month_name = calendar.month_name[month]
-                months.append(f"{month_name} {year}")
-        
-        self.month_combo.addItems(months)
+        self.month_combo.blockSignals(True)
+        self.month_combo.addItems(MONTH_CHOICES)
+        self.month_combo.blockSignals(False)
         
         # Set current month
         current_month = datetime.now().strftime("%B %Y")
@@ -471,19 +645,23 @@ class AttendancePyQtGUI(QMainWindow):
         if index >= 0:
             self.month_combo.setCurrentIndex(index)
         
+    @pyqtSlot()
     def browse_file(self):
         """Browse for document file."""
-        file_type = "Word Documents (*.docx)"
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select Document", "", file_type
-        )
+        if self._open_dialog is None:
+            self._open_dialog = QFileDialog(self, "Select Document", "", "Word Documents (*.docx)")
+            self._open_dialog.setFileMode(QFileDialog.ExistingFile)
+        
+        file_path = ""
+        if self._open_dialog.exec_():
+            file_path = self._open_dialog.selectedFiles()[0]
         
         if file_path:
             self.path_input.setText(file_path)
             # Save to config
             self.config.set('document_path', file_path)
             self.config.set('document_type', 'word')
-            self.log_message(f"📁 Document selected: {Path(file_path).name}")
+            logger.debug("Document selected: %s", Path(file_path).name)
         
     def start_monitoring(self):
         """Start event monitoring."""
@@ -492,17 +670,7 @@ class AttendancePyQtGUI(QMainWindow):
             self.start_btn.setEnabled(False)
             self.stop_btn.setEnabled(True)
             self.status_label.setText("▶️ Monitoring: Active")
-            self.status_label.setStyleSheet("""
-                QLabel {
-                    font-size: 16px;
-                    font-weight: bold;
-                    padding: 10px;
-                    background-color: #d4edda;
-                    color: #155724;
-                    border-radius: 8px;
-                    border: none;
-                }
-            """)
+            self._set_status_state("active")
             self.status_bar.showMessage("Monitoring started")
             self.log_message("🟢 Event monitoring started")
         except Exception as e:
@@ -515,122 +683,119 @@ class AttendancePyQtGUI(QMainWindow):
             self.start_btn.setEnabled(True)
             self.stop_btn.setEnabled(False)
             self.status_label.setText("⏹️ Monitoring: Stopped")
-            self.status_label.setStyleSheet("""
-                QLabel {
-                    font-size: 16px;
-                    font-weight: bold;
-                    padding: 10px;
-                    background-color: #f8d7da;
-                    color: #721c24;
-                    border-radius: 8px;
-                    border: none;
-                }
-            """)
+            self._set_status_state("stopped")
             self.status_bar.showMessage("Monitoring stopped")
             self.log_message("🔴 Event monitoring stopped")
         except Exception as e:
             self.show_error(f"Failed to stop monitoring: {str(e)}")
             
+    def _set_status_state(self, state):
+        """Switch status_label between its "active" and "stopped" styles."""
+        self.status_label.setProperty("state", state)
+        # Dynamic properties only restyle after a re-polish
+        style = self.status_label.style()
+        style.unpolish(self.status_label)
+        style.polish(self.status_label)
+    
+    def _document_handler(self):
+        """Return the handler for the selected document type, or None."""
+        doc_type = 'word' if self.word_radio.isChecked() else 'pdf'
+        return {'word': self.word_handler, 'pdf': self.pdf_handler}.get(doc_type)
+        
+    def _fill_document(self, handler, **kwargs):
+        """Fill the document, serialized with the web server's fills if it runs."""
+        if self.web_server:
+            return self.web_server.fill_document(handler.fill_attendance_sheet, **kwargs)
+        return handler.fill_attendance_sheet(**kwargs)
+        
+    @pyqtSlot()
     def manual_checkin(self):
         """Manual check-in."""
         try:
-            doc_type = 'word' if self.word_radio.isChecked() else 'pdf'
+            handler = self._document_handler()
+            if handler is None:
+                self.show_error("No document handler available. Please select a document type and file path.")
+                return
+            
             current_time = datetime.now()
-            if doc_type == 'word' and self.word_handler:
-                # Use word handler for manual check-in
-                result = self.word_handler.fill_attendance_sheet(time_in=current_time)
-                if result:
-                    self.last_checkin_time = current_time
-                    self.log_message("🟢 Manual check-in recorded successfully")
-                    self.status_bar.showMessage("Manual check-in recorded")
-                    self.show_info("Success", f"Check-in recorded at {current_time.strftime('%H:%M:%S')}")
-                else:
-                    self.log_message("❌ Failed to record check-in")
-                    self.show_error("Failed to record check-in. Please check document path.")
-            elif doc_type == 'pdf' and self.pdf_handler:
-                # Use PDF handler for manual check-in
-                result = self.pdf_handler.fill_attendance_sheet(time_in=current_time)
-                if result:
-                    self.last_checkin_time = current_time
-                    self.log_message("🟢 Manual check-in recorded successfully")
-                    self.status_bar.showMessage("Manual check-in recorded")
-                    self.show_info("Success", f"Check-in recorded at {current_time.strftime('%H:%M:%S')}")
-                else:
-                    self.log_message("❌ Failed to record check-in")
-                    self.show_error("Failed to record check-in. Please check document path.")
+            time_text = current_time.strftime('%H:%M:%S')
+            result = self._fill_document(handler, time_in=current_time)
+            if result:
+                # The document was saved in place, which the directory mtime misses
+                self._doc_cache = None
+                self.last_checkin_time = current_time
+                self.log_message("🟢 Manual check-in recorded successfully")
+                self.status_bar.showMessage("Manual check-in recorded")
+                self.show_info("Success", f"Check-in recorded at {time_text}")
             else:
-                self.show_error("No document handler available. Please select a document type and file path.")
+                self.log_message("❌ Failed to record check-in", logging.ERROR)
+                self.show_error("Failed to record check-in. Please check document path.")
                 
         except Exception as e:
-            self.log_message(f"❌ Error during manual check-in: {e}")
+            self.log_message(f"❌ Error during manual check-in: {e}", logging.ERROR)
             self.show_error(f"Failed to record check-in: {e}")
         
+    @pyqtSlot()
     def manual_checkout(self):
         """Manual check-out."""
         try:
-            doc_type = 'word' if self.word_radio.isChecked() else 'pdf'
+            handler = self._document_handler()
+            if handler is None:
+                self.show_error("No document handler available. Please select a document type and file path.")
+                return
+            
             current_time = datetime.now()
-            import traceback
-            # Debug: log the type and value of last_checkin_time and current_time
-            self.log_message(f"[DEBUG] last_checkin_time: {repr(getattr(self, 'last_checkin_time', None))} (type: {type(getattr(self, 'last_checkin_time', None))})")
-            self.log_message(f"[DEBUG] current_time: {repr(current_time)} (type: {type(current_time)})")
-            doc_type = 'word' if self.word_radio.isChecked() else 'pdf'
-            if doc_type == 'word' and self.word_handler:
-                time_in = getattr(self, 'last_checkin_time', None)
-                if time_in is None:
-                    time_in = current_time
-                self.log_message(f"[DEBUG] Using time_in for word: {repr(time_in)} (type: {type(time_in)})")
-                result = self.word_handler.fill_attendance_sheet(time_in=time_in, time_out=current_time)
-                if result:
-                    self.log_message("🔴 Manual check-out recorded successfully")
-                    self.status_bar.showMessage("Manual check-out recorded")
-                    self.show_info("Success", f"Check-out recorded at {current_time.strftime('%H:%M:%S')}")
-                else:
-                    self.log_message("❌ Failed to record check-out")
-                    self.show_error("Failed to record check-out. Please check document path.")
-            elif doc_type == 'pdf' and self.pdf_handler:
-                time_in = getattr(self, 'last_checkin_time', None)
-                if time_in is None:
-                    time_in = current_time
-                self.log_message(f"[DEBUG] Using time_in for pdf: {repr(time_in)} (type: {type(time_in)})")
-                result = self.pdf_handler.fill_attendance_sheet(time_in=time_in, time_out=current_time)
-                if result:
-                    self.log_message("🔴 Manual check-out recorded successfully")
-                    self.status_bar.showMessage("Manual check-out recorded")
-                    self.show_info("Success", f"Check-out recorded at {current_time.strftime('%H:%M:%S')}")
-                else:
-                    self.log_message("❌ Failed to record check-out")
-                    self.show_error("Failed to record check-out. Please check document path.")
+            time_text = current_time.strftime('%H:%M:%S')
+            logger.debug("last_checkin_time: %r, current_time: %r", self.last_checkin_time, current_time)
+            time_in = self.last_checkin_time
+            if time_in is None:
+                time_in = current_time
+            result = self._fill_document(handler, time_in=time_in, time_out=current_time)
+            if result:
+                self._doc_cache = None
+                self.log_message("🔴 Manual check-out recorded successfully")
+                self.status_bar.showMessage("Manual check-out recorded")
+                self.show_info("Success", f"Check-out recorded at {time_text}")
             else:
-                self.show_error("No document handler available. Please select a document type and file path.")
+                self.log_message("❌ Failed to record check-out", logging.ERROR)
+                self.show_error("Failed to record check-out. Please check document path.")
         except Exception as e:
-            self.log_message(f"❌ Error during manual check-out: {e}\n{traceback.format_exc()}")
+            self.log_message(f"❌ Error during manual check-out: {e}\n{traceback.format_exc()}", logging.ERROR)
             self.show_error(f"Failed to record check-out: {e}")
         
+    @pyqtSlot()
     def download_document(self):
         """Download/open the most recent filled documents."""
         try:
-            from pathlib import Path
-            from datetime import datetime
-            import os
-            import shutil
-            
             output_dir = Path(self.config.get('output_directory', 'filled_docs'))
             
-            if not output_dir.exists():
+            try:
+                dir_mtime = output_dir.stat().st_mtime_ns
+            except FileNotFoundError:
                 self.show_warning("No Documents", "No filled documents found. Please record some attendance first.")
                 self.log_message("No filled documents directory found")
                 return
             
-            # Get all document files (PDF and Word) sorted by modification time (newest first)
-            doc_files = list(output_dir.glob("*.pdf")) + list(output_dir.glob("*.docx")) + list(output_dir.glob("*.doc"))
+            # Reuse the last scan while no file was added to or removed from the directory
+            cache_key = (output_dir, dir_mtime)
+            if self._doc_cache and self._doc_cache[0] == cache_key:
+                doc_files = self._doc_cache[1]
+            else:
+                # Get all document files (PDF and Word) sorted by modification time (newest first),
+                # in one directory pass that reuses each entry's stat
+                with os.scandir(output_dir) as entries:
+                    doc_files = [
+                        (entry.stat().st_mtime, Path(entry.path)) for entry in entries
+                        if entry.name.lower().endswith(DOCUMENT_SUFFIXES) and entry.is_file()
+                    ]
+                doc_files.sort(key=lambda x: x[0], reverse=True)
+                self._doc_cache = (cache_key, doc_files)
+            
             if not doc_files:
                 self.show_warning("No Documents", "No filled documents found. Please record some attendance first.")
                 self.log_message("No filled documents found in output directory")
                 return
             
-            doc_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            
             # Show document selection dialog
             self.show_document_selection_dialog(doc_files)
             
@@ -639,16 +804,46 @@ class AttendancePyQtGUI(QMainWindow):
             self.show_error(f"Failed to access filled documents: {e}")
     
     def show_document_selection_dialog(self, doc_files):
-        """Show dialog to select and download document."""
-        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem
-        from datetime import datetime
-        import os
-        import shutil
+        """Show dialog to select and download document.
+        
+        Args:
+            doc_files: (mtime, path) pairs, newest first
+        """
+        dialog = self._ensure_download_dialog()
+        dialog.move(self.x() + 50, self.y() + 50)
+        doc_list = self._doc_list
+        
+        # Populate list with a single relayout at the end
+        doc_list.setUpdatesEnabled(False)
+        doc_list.clear()
+        for mtime, doc_file in doc_files:
+            mod_time = datetime.fromtimestamp(mtime).isoformat(sep=' ', timespec='seconds')
+            file_type, icon_key = TYPE_BY_SUFFIX.get(doc_file.suffix.lower(), ("Word", 'word'))
+            
+            item = QListWidgetItem(f"{doc_file.name}\n📅 {mod_time} • {file_type}")
+            item.setIcon(ICONS[icon_key])
+            item.setData(Qt.UserRole, doc_file)  # Store file path
+            doc_list.addItem(item)
+        doc_list.setUpdatesEnabled(True)
+        
+        # Select first item
+        if doc_files:
+            doc_list.setCurrentRow(0)
+        
+        dialog.exec_()
+    
+    def _ensure_download_dialog(self):
+        """Build the document selection dialog on first use.
+        
+        Returns:
+            The shared dialog
+        """
+        if self._download_dialog is not None:
+            return self._download_dialog
         
         dialog = QDialog(self)
         dialog.setWindowTitle("Select Document to Download")
         dialog.setGeometry(0, 0, 600, 400)
-        dialog.move(self.x() + 50, self.y() + 50)
         
         layout = QVBoxLayout(dialog)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -656,78 +851,25 @@ class AttendancePyQtGUI(QMainWindow):
         
         # Title
         title_label = QLabel("Select a filled document file:")
-        title_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #2c3e50;")
+        title_label.setObjectName("dialog_title")
         layout.addWidget(title_label)
         
         # Document list
         doc_list = QListWidget()
-        doc_list.setStyleSheet("""
-            QListWidget {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                background-color: white;
-                font-size: 14px;
-                padding: 5px;
-            }
-            QListWidget::item {
-                padding: 10px;
-                border-bottom: 1px solid #e9ecef;
-            }
-            QListWidget::item:selected {
-                background-color: #007bff;
-                color: white;
-            }
-            QListWidget::item:hover {
-                background-color: #f8f9fa;
-            }
-        """)
-        
-        # Populate list
-        for doc_file in doc_files:
-            mod_time = datetime.fromtimestamp(doc_file.stat().st_mtime)
-            file_type = "PDF" if doc_file.suffix.lower() == '.pdf' else "Word"
-            display_text = f"{doc_file.name}\n📅 {mod_time.strftime('%Y-%m-%d %H:%M:%S')} • 📄 {file_type}"
-            
-            item = QListWidgetItem(display_text)
-            item.setData(Qt.UserRole, doc_file)  # Store file path
-            doc_list.addItem(item)
-        
-        # Select first item
-        if doc_files:
-            doc_list.setCurrentRow(0)
-        
+        doc_list.setObjectName("doc_list")
         layout.addWidget(doc_list)
         
         # Buttons
         button_layout = QHBoxLayout()
         
-        open_btn = ModernButton("📂 Open Document", "#28a745", "#1e7e34")
-        save_btn = ModernButton("💾 Save As...", "#17a2b8", "#138496")
-        folder_btn = ModernButton("📁 Open Folder", "#ffc107", "#e0a800")
-        cancel_btn = ModernButton("❌ Cancel", "#6c757d", "#5a6268")
-        
-        def open_document():
-            current_item = doc_list.currentItem()
-            if current_item:
-                doc_file = current_item.data(Qt.UserRole)
-                self.open_document_file(doc_file)
-                dialog.accept()
-        
-        def save_document():
-            current_item = doc_list.currentItem()
-            if current_item:
-                doc_file = current_item.data(Qt.UserRole)
-                self.save_document_as(doc_file)
-                dialog.accept()
-        
-        def open_folder():
-            output_dir = Path(self.config.get('output_directory', 'filled_docs'))
-            self.open_folder(output_dir)
-            dialog.accept()
+        open_btn = ModernButton("Open Document", "success", icon_key='open')
+        save_btn = ModernButton("Save As...", "info", icon_key='save')
+        folder_btn = ModernButton("Open Folder", "warning", icon_key='folder')
+        cancel_btn = ModernButton("Cancel", "secondary", icon_key='cancel')
         
-        open_btn.clicked.connect(open_document)
-        save_btn.clicked.connect(save_document)
-        folder_btn.clicked.connect(open_folder)
+        open_btn.clicked.connect(self._open_selected_document)
+        save_btn.clicked.connect(self._save_selected_document)
+        folder_btn.clicked.connect(self._open_output_folder)
         cancel_btn.clicked.connect(dialog.reject)
         
         button_layout.addWidget(open_btn)
@@ -738,24 +880,50 @@ class AttendancePyQtGUI(QMainWindow):
         
         layout.addLayout(button_layout)
         
-        dialog.exec_()
+        self._download_dialog = dialog
+        self._doc_list = doc_list
+        return dialog
+    
+    @pyqtSlot()
+    def _open_selected_document(self):
+        """Open the document selected in the download dialog."""
+        current_item = self._doc_list.currentItem()
+        if current_item:
+            doc_file = current_item.data(Qt.UserRole)
+            self.open_document_file(doc_file)
+            self._download_dialog.accept()
+    
+    @pyqtSlot()
+    def _save_selected_document(self):
+        """Save a copy of the document selected in the download dialog."""
+        current_item = self._doc_list.currentItem()
+        if current_item:
+            doc_file = current_item.data(Qt.UserRole)
+            self.save_document_as(doc_file)
+            self._download_dialog.accept()
+    
+    @pyqtSlot()
+    def _open_output_folder(self):
+        """Open the output folder from the download dialog."""
+        output_dir = Path(self.config.get('output_directory', 'filled_docs'))
+        self.open_folder(output_dir)
+        self._download_dialog.accept()
     
     def open_document_file(self, doc_file):
         """Open document file with default application."""
         try:
-            import os
-            os.startfile(str(doc_file))  # Windows-specific
-            self.log_message(f"📂 Opened document: {doc_file.name}")
+            # Handed to the desktop shell without blocking the UI thread
+            if not QDesktopServices.openUrl(QUrl.fromLocalFile(str(doc_file))):
+                raise OSError(f"no application could open {doc_file.name}")
+            logger.debug("Opened document: %s", doc_file.name)
             self.status_bar.showMessage(f"Opened: {doc_file.name}")
         except Exception as e:
-            self.log_message(f"❌ Error opening document: {e}")
+            self.log_message(f"❌ Error opening document: {e}", logging.ERROR)
             self.show_error(f"Failed to open document: {e}")
     
     def save_document_as(self, doc_file):
         """Save document to a user-selected location."""
         try:
-            import shutil
-            
             # Determine file types based on original file
             if doc_file.suffix.lower() == '.pdf':
                 file_filter = "PDF files (*.pdf);;All files (*.*)"
@@ -764,39 +932,74 @@ class AttendancePyQtGUI(QMainWindow):
                 file_filter = "Word documents (*.docx);;Word 97-2003 (*.doc);;All files (*.*)"
                 default_suffix = doc_file.suffix
             
-            save_path, _ = QFileDialog.getSaveFileName(
-                self,
-                "Save Document As",
-                str(doc_file.name),
-                file_filter
-            )
+            if self._save_dialog is None:
+                self._save_dialog = QFileDialog(self, "Save Document As")
+                self._save_dialog.setAcceptMode(QFileDialog.AcceptSave)
+            self._save_dialog.setNameFilters(file_filter.split(';;'))
+            self._save_dialog.selectFile(str(doc_file.name))
+            
+            save_path = ""
+            if self._save_dialog.exec_():
+                save_path = self._save_dialog.selectedFiles()[0]
             
             if save_path:
                 # Ensure proper extension
                 if not save_path.endswith(default_suffix):
                     save_path += default_suffix
                 
-                shutil.copy2(str(doc_file), save_path)
-                self.log_message(f"💾 Document saved to: {save_path}")
-                self.status_bar.showMessage(f"Saved to: {Path(save_path).name}")
-                self.show_info("Success", f"Document saved successfully to:\n{save_path}")
+                # Copy off the GUI thread; the result is reported by the slots below
+                task = FileTask(shutil.copy2, str(doc_file), save_path, result=save_path)
+                self._start_file_task(task, self._on_document_saved, self._on_document_save_failed)
+                self.status_bar.showMessage(f"Saving {doc_file.name}...")
                 
         except Exception as e:
-            self.log_message(f"❌ Error saving document: {e}")
-            self.show_error(f"Failed to save document: {e}")
+            self._on_document_save_failed(str(e))
+    
+    @pyqtSlot(str)
+    def _on_document_saved(self, save_path):
+        """Report a copy finished by save_document_as."""
+        self._file_task_done()
+        self.log_message(f"💾 Document saved to: {save_path}")
+        self.status_bar.showMessage(f"Saved to: {Path(save_path).name}")
+        self.show_info("Success", f"Document saved successfully to:\n{save_path}")
+    
+    @pyqtSlot(str)
+    def _on_document_save_failed(self, error):
+        """Report a failure from save_document_as."""
+        self._file_task_done()
+        self.log_message(f"❌ Error saving document: {error}", logging.ERROR)
+        self.show_error(f"Failed to save document: {error}")
+    
+    def _start_file_task(self, task, on_finished, on_failed):
+        """Show the busy indicator and queue a FileTask."""
+        self._file_tasks.add(task)
+        # Drop the task before its result slot runs so the indicator can hide
+        task.signals.finished.connect(lambda _: self._file_tasks.discard(task))
+        task.signals.failed.connect(lambda _: self._file_tasks.discard(task))
+        task.signals.finished.connect(on_finished)
+        task.signals.failed.connect(on_failed)
+        self.file_progress.show()
+        QThreadPool.globalInstance().start(task)
+    
+    def _file_task_done(self):
+        """Hide the busy indicator once no FileTask is running."""
+        if not self._file_tasks:
+            self.file_progress.hide()
     
     def open_folder(self, folder_path):
         """Open folder in file explorer."""
         try:
-            import os
-            os.startfile(str(folder_path))  # Windows-specific
-            self.log_message(f"📁 Opened folder: {folder_path}")
+            # Handed to the desktop shell without blocking the UI thread
+            if not QDesktopServices.openUrl(QUrl.fromLocalFile(str(folder_path))):
+                raise OSError(f"no application could open {folder_path}")
+            logger.debug("Opened folder: %s", folder_path)
             self.status_bar.showMessage(f"Opened folder: {folder_path.name}")
         except Exception as e:
-            self.log_message(f"❌ Error opening folder: {e}")
+            self.log_message(f"❌ Error opening folder: {e}", logging.ERROR)
             self.show_error(f"Failed to open folder: {e}")
     
-    def on_doc_type_change(self):
+    @pyqtSlot(bool)
+    def on_doc_type_change(self, checked=False):
         """Handle document type change."""
         if self.word_radio.isChecked():
             doc_type = 'word'
@@ -808,12 +1011,13 @@ class AttendancePyQtGUI(QMainWindow):
         self.config.set('document_type', doc_type)
         
         # Update path input if it exists (avoid initialization order issues)
-        if hasattr(self, 'path_input'):
+        if self.path_input is not None:
             self.path_input.setText(path)
         
         self.log_message(f"📄 Document type changed to: {doc_type.upper()}")
     
-    def on_month_change(self):
+    @pyqtSlot(str)
+    def on_month_change(self, text=""):
         """Handle month selection change."""
         selected_month = self.month_combo.currentText()
         self.config.set('selected_month', selected_month)
@@ -827,39 +1031,44 @@ class AttendancePyQtGUI(QMainWindow):
         """Show warning message."""
         QMessageBox.warning(self, title, message)
         
+    @pyqtSlot()
     def clear_log(self):
         """Clear the log."""
+        self._log_buffer.clear()
         self.log_text.clear()
         self.log_message("📝 Log cleared")
         
-    def log_message(self, message):
-        """Add message to log."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
+    def log_message(self, message, level=logging.INFO):
+        """Add message to log.
         
-        # Only log to UI if log_text exists (avoid initialization order issues)
-        if hasattr(self, 'log_text'):
-            self.log_text.append(formatted_message)
-            
-            # Auto-scroll to bottom
-            scrollbar = self.log_text.verticalScrollBar()
-            scrollbar.setValue(scrollbar.maximum())
-        
-        # Always log to console/file with safe encoding
-        try:
-            # Remove emojis for logging compatibility
-            safe_message = message.encode('ascii', 'ignore').decode('ascii').strip()
-            if safe_message:  # Only log if there's text left after removing emojis
-                logger.info(safe_message)
-            else:
-                logger.info("Action completed")
-        except Exception:
-            logger.info("Action completed")
+        Args:
+            message: Text for the activity log
+            level: Logging level; records below INFO skip the activity log
+        """
+        # Emojis are stripped for the console/file by the logging listener
+        logger.log(level, message)
+    
+    def _queue_log_line(self, line):
+        """Queue a formatted line; bursts of lines are written in one update."""
+        self._log_buffer.append(line)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+        
+    def _flush_log(self):
+        """Write queued log lines to the log widget."""
+        # Only log to UI if log_text exists (avoid initialization order issues);
+        # while it is hidden lines stay queued until showEvent
+        if not self._log_buffer or self.log_text is None or not self.log_text.isVisible():
+            return
+        
+        # QPlainTextEdit keeps following the end if it was scrolled there
+        self.log_text.appendPlainText("\n".join(self._log_buffer))
+        self._log_buffer.clear()
         
     def show_error(self, message):
         """Show error message."""
         QMessageBox.critical(self, "Error", message)
-        self.log_message(f"❌ Error: {message}")
+        self.log_message(f"❌ Error: {message}", logging.ERROR)
         
     def on_login(self, event_data=None):
         """Handle login event."""
@@ -878,7 +1087,7 @@ class AttendancePyQtGUI(QMainWindow):
                 self.web_server.start_server()
                 self.log_message("📱 Web server started for mobile access")
             except Exception as e:
-                self.log_message(f"❌ Failed to start web server: {e}")
+                self.log_message(f"❌ Failed to start web server: {e}", logging.ERROR)
     
     def stop_web_server(self):
         """Stop the web server."""
@@ -887,13 +1096,14 @@ class AttendancePyQtGUI(QMainWindow):
                 self.web_server.stop_server()
                 self.log_message("📱 Web server stopped")
             except Exception as e:
-                self.log_message(f"❌ Failed to stop web server: {e}")
+                self.log_message(f"❌ Failed to stop web server: {e}", logging.ERROR)
                 
     def closeEvent(self, event):
         """Handle close event."""
         # Stop web server when closing
         if self.web_server:
             self.stop_web_server()
+        logger.removeHandler(self._log_handler)
         event.accept()
 
 def create_pyqt_app(config_manager, event_monitor, pdf_handler, word_handler=None, web_server=None):
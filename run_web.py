@@ -1,25 +1,35 @@
+import signal
+import threading
+
 from config_manager import ConfigManager
 from word_handler import WordHandler
 from pdf_handler import PDFHandler
 from web_server import create_web_server
 
-# Initialize config and handlers
-config = ConfigManager()
-word_handler = WordHandler(config)
-pdf_handler = PDFHandler(config)
+def create_server():
+    """Build the web server with its config and document handlers."""
+    config = ConfigManager()
+    word_handler = WordHandler(config)
+    pdf_handler = PDFHandler(config)
+    return create_web_server(config, word_handler, pdf_handler)
 
-# Create the web server and expose the Flask app
-web_server = create_web_server(config, word_handler, pdf_handler)
-app = web_server.app  # This exposes the Flask app for Gunicorn
+def create_app():
+    """App factory for Gunicorn ("run_web:create_app()")."""
+    return create_server().app
 
 if __name__ == "__main__":
     # Start the web server when running directly
+    web_server = create_server()
     web_server.start_server(host="0.0.0.0", port=5000)
     
-    # Keep the main thread alive
-    import time
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\nShutting down web server...")
\ No newline at end of file
+    # Keep the main thread alive until Ctrl+C or SIGTERM
+    stop = threading.Event()
+    
+    def _shutdown(signum, frame):
+        stop.set()
+    
+    signal.signal(signal.SIGINT, _shutdown)
+    signal.signal(signal.SIGTERM, _shutdown)
+    stop.wait()
+    print("\nShutting down web server...")
+    web_server.stop_server()
@@ -1,7 +1,9 @@
 """Splash screen for attendance tracker application."""
 
 import sys
-from PyQt5.QtWidgets import QApplication, QSplashScreen, QLabel, QVBoxLayout, QWidget, QProgressBar
+import os
+import hashlib
+from PyQt5.QtWidgets import QApplication, QSplashScreen
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QPixmap, QPainter, QFont, QColor, QLinearGradient, QBrush
 from pathlib import Path
@@ -9,6 +11,30 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+LOGO_PATH = Path("assets/logo.png")
+# Directory of rendered splash images; each file is named by the hash of its
+# render inputs, so any change to them renders and caches a new image
+SPLASH_CACHE_DIR = Path(os.getenv('APPDATA') or os.path.expanduser('~')) / "AttendanceTracker" / "cache"
+
+SPLASH_SIZE = (800, 600)
+SPLASH_TITLE = "Khaled's Attendance Tracker"
+SPLASH_SUBTITLE = "Professional Time Management Solution"
+SPLASH_VERSION = "Version 2.0 - Modern PyQt Edition with Mobile PWA"
+# Bump when render_splash_pixmap draws something different from the same inputs
+SPLASH_RENDER_REVISION = 1
+
+
+def splash_cache_path():
+    """Path of the cached splash image for the current render inputs."""
+    key = hashlib.blake2b(digest_size=8)
+    key.update(repr((SPLASH_RENDER_REVISION, SPLASH_SIZE, SPLASH_TITLE,
+                     SPLASH_SUBTITLE, SPLASH_VERSION)).encode('utf-8'))
+    try:
+        key.update(LOGO_PATH.read_bytes())
+    except OSError:
+        key.update(b'no logo')
+    return SPLASH_CACHE_DIR / f"splash-{key.hexdigest()}.png"
+
 class ModernSplashScreen(QSplashScreen):
     """Modern splash screen with custom branding."""
     
@@ -32,8 +58,43 @@ class ModernSplashScreen(QSplashScreen):
         logger.info("Splash screen initialized")
     
     def create_splash_pixmap(self):
-        """Create custom splash screen pixmap."""
-        width, height = 800, 600
+        """Create custom splash screen pixmap, reusing the cached render when current."""
+        cache_path = splash_cache_path()
+        pixmap = self._load_cached_pixmap(cache_path)
+        if pixmap is not None:
+            return pixmap
+        
+        pixmap = self.render_splash_pixmap()
+        try:
+            SPLASH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            pixmap.save(str(cache_path), "PNG")
+            # Drop images rendered from older inputs
+            for stale in SPLASH_CACHE_DIR.glob("splash*.png"):
+                if stale != cache_path:
+                    stale.unlink()
+        except OSError as e:
+            logger.debug(f"Could not cache splash image: {e}")
+        return pixmap
+    
+    def _load_cached_pixmap(self, cache_path):
+        """Load the cached splash image.
+        
+        Args:
+            cache_path: Cache file for the current render inputs
+            
+        Returns:
+            The cached QPixmap, or None if it is missing or unreadable
+        """
+        try:
+            cache_path.stat()
+        except OSError:
+            return None
+        pixmap = QPixmap(str(cache_path))
+        return None if pixmap.isNull() else pixmap
+    
+    def render_splash_pixmap(self):
+        """Paint the splash screen pixmap."""
+        width, height = SPLASH_SIZE
         pixmap = QPixmap(width, height)
         pixmap.fill(Qt.transparent)
         
@@ -57,9 +118,8 @@ class ModernSplashScreen(QSplashScreen):
         painter.fillRect(0, 0, width, height, overlay_brush)
         
         # Load and draw logo if exists
-        logo_path = Path("assets/logo.png")
-        if logo_path.exists():
-            logo_pixmap = QPixmap(str(logo_path))
+        if LOGO_PATH.exists():
+            logo_pixmap = QPixmap(str(LOGO_PATH))
             logo_size = 120
             logo_scaled = logo_pixmap.scaled(logo_size, logo_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_x = (width - logo_size) // 2
@@ -71,7 +131,7 @@ class ModernSplashScreen(QSplashScreen):
         title_font = QFont("Segoe UI", 32, QFont.Bold)
         painter.setFont(title_font)
         
-        title_text = "Khaled's Attendance Tracker"
+        title_text = SPLASH_TITLE
         title_rect = painter.fontMetrics().boundingRect(title_text)
         title_x = (width - title_rect.width()) // 2
         title_y = height // 2 - 50
@@ -82,7 +142,7 @@ class ModernSplashScreen(QSplashScreen):
         painter.setFont(subtitle_font)
         painter.setPen(QColor(255, 255, 255, 200))
         
-        subtitle_text = "Professional Time Management Solution"
+        subtitle_text = SPLASH_SUBTITLE
         subtitle_rect = painter.fontMetrics().boundingRect(subtitle_text)
         subtitle_x = (width - subtitle_rect.width()) // 2
         subtitle_y = title_y + 50
@@ -93,7 +153,7 @@ class ModernSplashScreen(QSplashScreen):
         painter.setFont(version_font)
         painter.setPen(QColor(255, 255, 255, 180))
         
-        version_text = "Version 2.0 - Modern PyQt Edition with Mobile PWA"
+        version_text = SPLASH_VERSION
         version_rect = painter.fontMetrics().boundingRect(version_text)
         version_x = (width - version_rect.width()) // 2
         version_y = subtitle_y + 40
@@ -114,10 +174,10 @@ class ModernSplashScreen(QSplashScreen):
             QColor(255, 255, 255)
         )
         
-        # Force update
-        QApplication.processEvents()
+        # Paint now without pumping unrelated events
+        self.repaint()
         
-        logger.info(f"Splash progress: {value}% - {message}")
+        logger.info("Splash progress: %s%% - %s", value, message)
     
     def set_progress(self, value, message=""):
         """Set progress value and optional message."""
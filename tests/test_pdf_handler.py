@@ -0,0 +1,56 @@
+"""Tests for the PDF handler."""
+
+import shutil
+
+from PyPDF2 import PdfReader
+from reportlab.pdfgen import canvas
+
+from pdf_handler import PDFHandler
+
+
+class _Config:
+    """Minimal stand-in for ConfigManager."""
+
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+def _make_form_pdf(path):
+    pdf = canvas.Canvas(str(path))
+    pdf.acroForm.textfield(name='time_in', x=100, y=700, width=200, height=20)
+    pdf.showPage()
+    pdf.save()
+
+
+def test_filled_form_keeps_acroform_with_need_appearances(tmp_path):
+    source = tmp_path / 'form.pdf'
+    _make_form_pdf(source)
+    handler = PDFHandler(_Config({'output_directory': str(tmp_path / 'out')}))
+
+    output_path = handler._fill_pdf_form(str(source), {'time_in': '09:00'})
+
+    assert output_path is not None
+    root = PdfReader(output_path).trailer['/Root']
+    assert '/AcroForm' in root
+    assert root['/AcroForm'].get('/NeedAppearances') == True
+    annotations = [annotation.get_object() for annotation in PdfReader(output_path).pages[0]['/Annots']]
+    assert [annotation['/V'] for annotation in annotations if annotation['/T'] == 'time_in'] == ['09:00']
+
+
+def test_output_directory_recreated_after_it_is_removed(tmp_path):
+    source = tmp_path / 'sheet.pdf'
+    pdf = canvas.Canvas(str(source))
+    pdf.showPage()
+    pdf.save()
+    output_dir = tmp_path / 'out'
+    handler = PDFHandler(_Config({'output_directory': str(output_dir)}))
+
+    assert handler._overlay_pdf_text(str(source), {}) is not None
+    shutil.rmtree(output_dir)
+
+    # The write into the missing directory fails once, then the directory is recreated
+    handler._overlay_pdf_text(str(source), {})
+    assert handler._overlay_pdf_text(str(source), {}) is not None
@@ -2,14 +2,17 @@
 
 import os
 import json
+import heapq
+import hashlib
 import logging
 from datetime import datetime
 from pathlib import Path
-from threading import Thread
+from threading import Lock, Thread
 import socket
 
-from flask import Flask, render_template, request, jsonify
-from flask_socketio import SocketIO, emit
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory
+from flask_socketio import SocketIO, emit, join_room
+from werkzeug.serving import make_server
 
 from config_manager import ConfigManager
 from word_handler import WordHandler
@@ -17,6 +20,41 @@ from pdf_handler import PDFHandler
 
 logger = logging.getLogger(__name__)
 
+# Content types of the documents the download route serves
+DOWNLOAD_MIMETYPES = {
+    '.pdf': 'application/pdf',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+# SocketIO room of clients that receive attendance_update events
+ATTENDANCE_ROOM = 'attendance'
+
+# PWA manifest, served by the /manifest.json route
+MANIFEST = {
+    "name": "Khaled's Attendance Tracker",
+    "short_name": "Attendance",
+    "description": "Mobile control for attendance tracking",
+    "start_url": "/",
+    "display": "standalone",
+    "background_color": "#ffffff",
+    "theme_color": "#007bff",
+    "orientation": "portrait",
+    "icons": [
+        {
+            "src": "/static/icon-192.png",
+            "sizes": "192x192",
+            "type": "image/png",
+            "purpose": "any maskable"
+        },
+        {
+            "src": "/static/icon-512.png", 
+            "sizes": "512x512",
+            "type": "image/png",
+            "purpose": "any maskable"
+        }
+    ]
+}
+
 class AttendanceWebServer:
     """Web server for mobile control of attendance tracker."""
     
@@ -31,6 +69,8 @@ class AttendanceWebServer:
         self.config = config_manager
         self.word_handler = word_handler
         self.pdf_handler = pdf_handler
+        # The manifest never changes, so its body is built once
+        self._manifest_body = json.dumps(MANIFEST).encode('utf-8')
         # Create Flask app
         self.app = Flask(__name__, 
                         template_folder='web_templates',
@@ -41,21 +81,27 @@ class AttendanceWebServer:
         # Setup routes
         self._setup_routes()
         self._setup_socketio_events()
+        # Held around every document fill, by the routes and by the desktop GUI
+        self.fill_lock = Lock()
         # Server state
         self.server_thread = None
+        self.http_server = None
         self.is_running = False
+        # Local IP found by the first successful get_local_ip
+        self._local_ip = None
+        # (latest documents' stats, JSON body, ETag) from the last recent-documents request
+        self._recent_cache = None
         
     def _setup_routes(self):
         @self.app.route('/api/download/<filename>')
         def download_document(filename):
             """Serve a filled document for download."""
-            from flask import send_from_directory, abort
-            import os
+            # send_from_directory rejects paths outside output_dir and 404s on
+            # missing files; conditional requests get 304/Range responses
             output_dir = self.config.get('output_directory', 'filled_docs')
-            file_path = os.path.join(output_dir, filename)
-            if not os.path.isfile(file_path):
-                abort(404)
-            return send_from_directory(output_dir, filename, as_attachment=True)
+            mimetype = DOWNLOAD_MIMETYPES.get(os.path.splitext(filename)[1].lower(), 'application/octet-stream')
+            return send_from_directory(output_dir, filename, as_attachment=True,
+                                       mimetype=mimetype, conditional=True)
         """Setup Flask routes."""
         
         @self.app.route('/')
@@ -71,13 +117,15 @@ class AttendanceWebServer:
                 doc_path = self.config.get('document_path' if doc_type == 'word' else 'pdf_path', '')
                 
                 status = {
-                    'timestamp': datetime.now().isoformat(),
                     'document_type': doc_type,
                     'document_path': Path(doc_path).name if doc_path else 'Not selected',
                     'month': self.config.get('selected_month', 'August 2025'),
                     'server_status': 'running'
                 }
-                return jsonify(status)
+                # Weak ETag: responses differing only in timestamp are equivalent
+                etag = self._etag(json.dumps(status, sort_keys=True).encode('utf-8'))
+                status['timestamp'] = datetime.now().isoformat()
+                return self._conditional_json(json.dumps(status).encode('utf-8'), etag, weak=True)
             except Exception as e:
                 logger.error(f"Error getting status: {e}")
                 return jsonify({'error': str(e)}), 500
@@ -87,31 +135,32 @@ class AttendanceWebServer:
             """Handle manual check-in from mobile."""
             try:
                 current_time = datetime.now()
+                time_text = current_time.strftime('%H:%M:%S')
                 doc_type = self.config.get('document_type', 'word')
                 
                 if doc_type == 'word' and self.word_handler:
-                    result = self.word_handler.fill_attendance_sheet(time_in=current_time)
+                    result = self.fill_document(self.word_handler.fill_attendance_sheet, time_in=current_time)
                 elif doc_type == 'pdf' and self.pdf_handler:
-                    result = self.pdf_handler.fill_attendance_sheet(time_in=current_time)
+                    result = self.fill_document(self.pdf_handler.fill_attendance_sheet, time_in=current_time)
                 else:
                     return jsonify({'error': 'No document handler available'}), 400
                 
                 if result:
-                    message = f"Check-in recorded at {current_time.strftime('%H:%M:%S')}"
+                    message = f"Check-in recorded at {time_text}"
                     logger.info(f"Mobile check-in: {message}")
                     
-                    # Emit to all connected clients
+                    # Emit to clients subscribed to attendance updates
                     self.socketio.emit('attendance_update', {
                         'type': 'checkin',
-                        'time': current_time.strftime('%H:%M:%S'),
+                        'time': time_text,
                         'message': message
-                    })
+                    }, to=ATTENDANCE_ROOM)
                     
                     return jsonify({
                         'success': True,
                         'message': message,
-                        'time': current_time.strftime('%H:%M:%S'),
-                        'document': Path(result).name if result else None
+                        'time': time_text,
+                        'document': Path(result).name
                     })
                 else:
                     return jsonify({'error': 'Failed to record check-in'}), 500
@@ -125,6 +174,7 @@ class AttendanceWebServer:
             """Handle manual check-out from mobile."""
             try:
                 current_time = datetime.now()
+                time_text = current_time.strftime('%H:%M:%S')
                 doc_type = self.config.get('document_type', 'word')
                 
                 if doc_type == 'word' and self.word_handler:
@@ -132,32 +182,32 @@ class AttendanceWebServer:
                     time_in = getattr(self, 'last_checkin_time', None)
                     if time_in is None:
                         time_in = current_time
-                    result = self.word_handler.fill_attendance_sheet(time_in=time_in, time_out=current_time)
+                    result = self.fill_document(self.word_handler.fill_attendance_sheet, time_in=time_in, time_out=current_time)
                 elif doc_type == 'pdf' and self.pdf_handler:
                     # Try to retrieve last check-in time if available, else use current_time
                     time_in = getattr(self, 'last_checkin_time', None)
                     if time_in is None:
                         time_in = current_time
-                    result = self.pdf_handler.fill_attendance_sheet(time_in=time_in, time_out=current_time)
+                    result = self.fill_document(self.pdf_handler.fill_attendance_sheet, time_in=time_in, time_out=current_time)
                 else:
                     return jsonify({'error': 'No document handler available'}), 400
                 
                 if result:
-                    message = f"Check-out recorded at {current_time.strftime('%H:%M:%S')}"
+                    message = f"Check-out recorded at {time_text}"
                     logger.info(f"Mobile check-out: {message}")
                     
-                    # Emit to all connected clients
+                    # Emit to clients subscribed to attendance updates
                     self.socketio.emit('attendance_update', {
                         'type': 'checkout',
-                        'time': current_time.strftime('%H:%M:%S'),
+                        'time': time_text,
                         'message': message
-                    })
+                    }, to=ATTENDANCE_ROOM)
                     
                     return jsonify({
                         'success': True,
                         'message': message,
-                        'time': current_time.strftime('%H:%M:%S'),
-                        'document': Path(result).name if result else None
+                        'time': time_text,
+                        'document': Path(result).name
                     })
                 else:
                     return jsonify({'error': 'Failed to record check-out'}), 500
@@ -170,26 +220,19 @@ class AttendanceWebServer:
         def get_recent_documents():
             """Get list of recent filled documents."""
             try:
-                output_dir = Path(self.config.get('output_directory', 'filled_docs'))
+                output_dir = self.config.get('output_directory', 'filled_docs')
                 
-                if not output_dir.exists():
+                try:
+                    recent = self._scan_recent_documents(output_dir)
+                except FileNotFoundError:
                     return jsonify({'documents': []})
                 
-                # Get recent documents
-                doc_files = list(output_dir.glob("*.pdf")) + list(output_dir.glob("*.docx"))
-                doc_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-                
-                documents = []
-                for doc_file in doc_files[:5]:  # Latest 5 documents
-                    mod_time = datetime.fromtimestamp(doc_file.stat().st_mtime)
-                    documents.append({
-                        'name': doc_file.name,
-                        'modified': mod_time.strftime('%Y-%m-%d %H:%M:%S'),
-                        'type': 'PDF' if doc_file.suffix.lower() == '.pdf' else 'Word',
-                        'size': f"{doc_file.stat().st_size / 1024:.1f} KB"
-                    })
-                
-                return jsonify({'documents': documents})
+                # Check-ins rewrite documents in place, so key on their stats
+                cache_key = tuple((name, stat.st_mtime_ns, stat.st_size) for name, stat in recent)
+                if self._recent_cache is None or self._recent_cache[0] != cache_key:
+                    body = self._recent_documents_body(recent)
+                    self._recent_cache = (cache_key, body, self._etag(body))
+                return self._conditional_json(self._recent_cache[1], self._recent_cache[2])
                 
             except Exception as e:
                 logger.error(f"Error getting recent documents: {e}")
@@ -198,31 +241,84 @@ class AttendanceWebServer:
         @self.app.route('/manifest.json')
         def manifest():
             """PWA manifest file."""
-            manifest_data = {
-                "name": "Khaled's Attendance Tracker",
-                "short_name": "Attendance",
-                "description": "Mobile control for attendance tracking",
-                "start_url": "/",
-                "display": "standalone",
-                "background_color": "#ffffff",
-                "theme_color": "#007bff",
-                "orientation": "portrait",
-                "icons": [
-                    {
-                        "src": "/static/icon-192.png",
-                        "sizes": "192x192",
-                        "type": "image/png",
-                        "purpose": "any maskable"
-                    },
-                    {
-                        "src": "/static/icon-512.png", 
-                        "sizes": "512x512",
-                        "type": "image/png",
-                        "purpose": "any maskable"
-                    }
-                ]
-            }
-            return jsonify(manifest_data)
+            return Response(self._manifest_body, mimetype='application/manifest+json',
+                            headers={'Cache-Control': 'public, max-age=86400'})
+    
+    @staticmethod
+    def _etag(data):
+        """Hash response data into an ETag value."""
+        return hashlib.blake2b(data, digest_size=8).hexdigest()
+    
+    def _conditional_json(self, body, etag, weak=False):
+        """Build a JSON response that answers a matching If-None-Match with 304.
+        
+        Args:
+            body: JSON body as bytes
+            etag: ETag value for the body
+            weak: Whether the ETag is a weak validator
+            
+        Returns:
+            Flask response
+        """
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag, weak=weak)
+        # Clients may keep the body but must revalidate before reusing it
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    
+    def fill_document(self, fill, **kwargs):
+        """Run a document fill while holding the fill lock.
+        
+        Mobile clients and the desktop GUI share the same handlers, so fills
+        are serialized rather than rewriting the same document concurrently.
+        
+        Args:
+            fill: Handler fill_attendance_sheet method
+            **kwargs: Arguments for the fill
+            
+        Returns:
+            The fill's result
+        """
+        with self.fill_lock:
+            return fill(**kwargs)
+    
+    def _scan_recent_documents(self, output_dir, limit=5):
+        """Find the most recently modified filled documents.
+        
+        Args:
+            output_dir: Directory holding the filled documents
+            limit: Number of most recent documents to return
+            
+        Returns:
+            List of (name, stat) pairs, latest first
+        """
+        # One directory read; on Windows scandir also supplies the stat data
+        with os.scandir(output_dir) as entries:
+            docs = [
+                (entry.name, entry.stat()) for entry in entries
+                if entry.name.lower().endswith(('.pdf', '.docx')) and entry.is_file()
+            ]
+        return heapq.nlargest(limit, docs, key=lambda item: item[1].st_mtime)
+    
+    def _recent_documents_body(self, recent):
+        """Serialize the recent-documents response.
+        
+        Args:
+            recent: (name, stat) pairs from _scan_recent_documents
+            
+        Returns:
+            JSON body as bytes
+        """
+        documents = []
+        for name, stat in recent:
+            mod_time = datetime.fromtimestamp(stat.st_mtime)
+            documents.append({
+                'name': name,
+                'modified': mod_time.strftime('%Y-%m-%d %H:%M:%S'),
+                'type': 'PDF' if name.lower().endswith('.pdf') else 'Word',
+                'size': f"{stat.st_size / 1024:.1f} KB"
+            })
+        return json.dumps({'documents': documents}).encode('utf-8')
     
     def _setup_socketio_events(self):
         """Setup SocketIO events for real-time communication."""
@@ -231,6 +327,7 @@ class AttendanceWebServer:
         def handle_connect():
             """Handle client connection."""
             logger.info("Mobile client connected")
+            join_room(ATTENDANCE_ROOM)
             emit('status', {'message': 'Connected to attendance tracker'})
         
         @self.socketio.on('disconnect')
@@ -245,15 +342,31 @@ class AttendanceWebServer:
     
     def get_local_ip(self):
         """Get the local IP address."""
+        if self._local_ip is None:
+            self._local_ip = self._compute_local_ip()
+            if self._local_ip is None:
+                # Not cached, so a later call can pick up the network
+                return '127.0.0.1'
+        return self._local_ip
+    
+    def refresh_local_ip(self):
+        """Forget the cached local IP, e.g. after a network change."""
+        self._local_ip = None
+        return self.get_local_ip()
+    
+    def _compute_local_ip(self):
+        """Look up the local IP address.
+        
+        Returns:
+            The address, or None if it could not be determined
+        """
         try:
-            # Connect to a remote server to determine local IP
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.connect(('8.8.8.8', 80))
-            local_ip = sock.getsockname()[0]
-            sock.close()
-            return local_ip
-        except Exception:
-            return '127.0.0.1'
+            # Connecting a UDP socket only picks the outgoing route; no packet is sent
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.connect(('8.8.8.8', 80))
+                return sock.getsockname()[0]
+        except OSError:
+            return None
     
     def start_server(self, host='0.0.0.0', port=5000):
         """Start the web server in a separate thread."""
@@ -261,9 +374,13 @@ class AttendanceWebServer:
             logger.warning("Web server is already running")
             return
         
+        # Same threaded Werkzeug server socketio.run uses in threading mode,
+        # kept so stop_server can shut it down
+        self.http_server = make_server(host, port, self.app, threaded=True)
+        
         def run_server():
             logger.info(f"Starting web server on {host}:{port}")
-            self.socketio.run(self.app, host=host, port=port, debug=False, allow_unsafe_werkzeug=True)
+            self.http_server.serve_forever(poll_interval=0.1)
         
         self.server_thread = Thread(target=run_server, daemon=True)
         self.server_thread.start()
@@ -300,6 +417,10 @@ class AttendanceWebServer:
             return
         
         self.is_running = False
+        self.http_server.shutdown()
+        self.server_thread.join(timeout=5)
+        self.http_server.server_close()
+        self.http_server = None
         logger.info("Web server stopped")
     
     def get_server_url(self):
@@ -1,18 +1,93 @@
 """Word document handling module for attendance tracking."""
 
+import io
 import os
+import shutil
+import tempfile
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 import logging
 import calendar
+import re
+from copy import deepcopy
 
 from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
 from docx.shared import Inches
 from docx.table import Table, _Cell
 
 logger = logging.getLogger(__name__)
 
+# Header classifier for _identify_columns. Alternatives are tried in order at
+# the start of the lowercased header, so earlier column types take priority;
+# the anchored \Z alternatives only accept the whole header.
+_HEADER_RE = re.compile(r"""
+    (?=.*(?:date|dt))(?P<date>)
+  | (?=.*(?:day|weekday))(?P<day>)
+  | (?=.*time\ in|(?:timein|in\ time|intime|check\ in|checkin|start|start\ time)\Z)(?P<time_in>)
+  | (?=.*time\ out|(?:timeout|out\ time|outtime|check\ out|checkout|end|end\ time)\Z)(?P<time_out>)
+  | (?=.*(?:hours|total|duration))(?P<hours>)
+""", re.VERBOSE | re.DOTALL)
+
+# Date spellings recognised in the date column
+_DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y')
+# Zero-padded dates in those formats, which have a single spelling per date
+_PADDED_DATE_RE = re.compile(r'\d{4}-\d\d-\d\d|\d\d[/-]\d\d[/-]\d{4}')
+
+# Header keywords of an attendance table; two distinct matches identify one
+_ATTENDANCE_KEYWORDS = ('date', 'day', 'time in', 'time out', 'hours', 'attendance')
+
+# Cell texts that still leave a row empty when looking for a row to fill,
+# for the date row and for the weekend rows
+_EMPTY_ROW_MARKERS = frozenset({'-'})
+_EMPTY_WEEKEND_ROW_MARKERS = frozenset({'-', 'N/A'})
+
+# Cell contents treated as unfilled, compared after strip().upper()
+_PLACEHOLDERS = frozenset({'', '-', '--', 'N/A', 'TBD', 'TIME', 'DATE', 'DAY', 'HH:MM', 'DD/MM/YYYY'})
+
+# Light gray (RGB: 220, 220, 220) cell shading for weekend rows, copied per cell
+_WEEKEND_SHADING = OxmlElement('w:shd')
+_WEEKEND_SHADING.set(qn('w:fill'), 'DCDCDC')
+
+_W_P, _W_R, _W_T, _W_HYPERLINK = qn('w:p'), qn('w:r'), qn('w:t'), qn('w:hyperlink')
+# Elements whose text python-docx renders specially, or which hold paragraphs
+# of their own; a cell containing any of them is read through _Cell.text
+_W_SPECIAL = tuple(qn(tag) for tag in ('w:br', 'w:cr', 'w:noBreakHyphen', 'w:ptab', 'w:tab', 'w:tbl'))
+
+
+def _cell_text(cell: _Cell) -> str:
+    """Return cell.text, reading plain single-paragraph cells straight from the XML.
+    
+    _Cell.text builds a Paragraph per paragraph and runs an XPath query per
+    paragraph and run. Table scans read every cell, and nearly all of them hold
+    one paragraph of plain runs, so those are joined from their <w:t> elements
+    directly; anything else falls back to _Cell.text.
+    
+    Args:
+        cell: Table cell to read
+        
+    Returns:
+        The cell's text, identical to cell.text
+    """
+    tc = cell._tc
+    paragraph = None
+    parts = []
+    for element in tc.iter(_W_P, _W_T, *_W_SPECIAL):
+        if element.tag == _W_T:
+            run = element.getparent()
+            container = run.getparent()
+            if run.tag != _W_R or not (container is paragraph or
+                                       (container.tag == _W_HYPERLINK and container.getparent() is paragraph)):
+                return cell.text
+            parts.append(element.text or '')
+        elif element.tag == _W_P and paragraph is None and element.getparent() is tc:
+            paragraph = element
+        else:
+            return cell.text
+    return ''.join(parts)
+
 class WordHandler:
     """Handles Word document reading, filling, and generation."""
     
@@ -24,6 +99,12 @@ class WordHandler:
         """
         self.config = config_manager
         self.last_filled_doc = None
+        # (header row element, column map) from the last _identify_columns call
+        self._columns_cache = None
+        # (path, (mtime_ns, size), Document) of the last document saved
+        self._doc_cache = None
+        # Output directories already created or found by _generate_output_path
+        self._output_dirs_ready = set()
         
     def fill_attendance_sheet(self, time_in: datetime = None, time_out: datetime = None) -> Optional[str]:
         """Fill attendance sheet with timestamps.
@@ -39,25 +120,42 @@ class WordHandler:
         
         # Check if we should use the last filled document for updates
         current_date = datetime.now().date()
-        if (self.last_filled_doc and 
-            os.path.exists(self.last_filled_doc) and 
-            time_out and not time_in):  # This is a check-out operation
-            
-            # Check if the last document was created today
-            last_doc_stat = os.path.getmtime(self.last_filled_doc)
-            last_doc_date = datetime.fromtimestamp(last_doc_stat).date()
+        # Stat of doc_path, which also tells whether the document exists
+        doc_stat = None
+        if self.last_filled_doc and time_out and not time_in:  # This is a check-out operation
+            # Check if the last document was created today; one stat covers both
+            # its existence and its modification time
+            try:
+                last_doc_stat = os.stat(self.last_filled_doc)
+            except OSError:
+                last_doc_stat = None
             
-            if last_doc_date == current_date:
+            if last_doc_stat is not None and datetime.fromtimestamp(last_doc_stat.st_mtime).date() == current_date:
                 logger.info(f"Using existing document for check-out: {self.last_filled_doc}")
                 doc_path = self.last_filled_doc
+                doc_stat = last_doc_stat
+        
+        if doc_stat is None and doc_path:
+            try:
+                doc_stat = os.stat(doc_path)
+            except OSError:
+                pass
         
-        if not doc_path or not os.path.exists(doc_path):
+        if doc_stat is None:
             logger.error(f"Word document not found: {doc_path}")
             return None
         
+        # Take the cached document; it is only put back after a successful save,
+        # so a failed fill never leaves a half-modified document cached
+        cached, self._doc_cache = self._doc_cache, None
+        
         try:
-            # Load the document
-            doc = Document(doc_path)
+            # Load the document, reusing the one saved last time if the file
+            # has not changed since
+            if cached and cached[:2] == (doc_path, (doc_stat.st_mtime_ns, doc_stat.st_size)):
+                doc = cached[2]
+            else:
+                doc = Document(doc_path)
             
             # Get current date and determine if it's a weekend
             is_weekend = self._is_weekend(current_date)
@@ -71,33 +169,66 @@ class WordHandler:
                 logger.error("No attendance table found in document")
                 return None
             
+            # Formats used for every cell written during this fill
+            date_format = self.config.get('date_format', '%d/%m/%Y')
+            time_format = self.config.get('time_format', '%H:%M')
+            
             # Fill the table based on current date and events
-            self._fill_table_for_date(attendance_table, current_date, time_in, time_out, is_weekend)
+            self._fill_table_for_date(attendance_table, current_date, time_in, time_out, is_weekend,
+                                      date_format, time_format)
             
             # If it's Friday and we're checking in, automatically fill weekend days
             if current_date.weekday() == 4 and time_in:  # Friday = 4
-                self._fill_weekend_days(attendance_table, current_date)
+                self._fill_weekend_days(attendance_table, current_date, date_format)
             
             # Save the filled document
             if doc_path == self.last_filled_doc:
                 # Update existing document
                 output_path = doc_path
                 logger.info(f"Updating existing document: {output_path}")
+                self._replace_document(doc, output_path)
             else:
                 # Create new document
                 output_path = self._generate_output_path(doc_path)
                 logger.info(f"Creating new document: {output_path}")
+                doc.save(output_path)
             
-            doc.save(output_path)
-            
+            saved_stat = os.stat(output_path)
+            self._doc_cache = (output_path, (saved_stat.st_mtime_ns, saved_stat.st_size), doc)
             self.last_filled_doc = output_path
             logger.info(f"Word document filled successfully: {output_path}")
             return output_path
             
         except Exception as e:
+            # The output directory may have been removed; check again next time
+            self._output_dirs_ready.clear()
             logger.error(f"Error filling Word document: {e}")
             return None
     
+    def _replace_document(self, doc: Document, path: str):
+        """Overwrite an existing document atomically.
+        
+        The document is serialized in memory, written to a temporary file next
+        to the target in one go and then moved over it, so the file we loaded
+        from is never left half-written.
+        
+        Args:
+            doc: Word document to save
+            path: Existing document path to replace
+        """
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        
+        fd, temp_path = tempfile.mkstemp(suffix='.docx', dir=os.path.dirname(path) or '.')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(buffer.getbuffer())
+            shutil.copymode(path, temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    
     def _is_weekend(self, date) -> bool:
         """Check if the given date is a weekend (Saturday or Sunday).
         
@@ -119,10 +250,13 @@ class WordHandler:
         if not selected_month:
             return
         
-        # Look for paragraphs that contain "Month:" and fill the value after it
+        # Look for the paragraph that contains "Month:" and fill the value after it
         for paragraph in doc.paragraphs:
             text = paragraph.text
-            if 'Month:' in text and not selected_month in text:
+            if 'Month:' in text:
+                if selected_month in text:
+                    # Already filled, e.g. when updating a document for check-out
+                    return
                 # Replace the text after "Month:" with the selected month
                 paragraph.text = f"Month: {selected_month}"
                 logger.info(f"Added month '{selected_month}' to document")
@@ -154,20 +288,24 @@ class WordHandler:
         Returns:
             True if likely an attendance table
         """
-        # Check for common attendance table headers
-        headers = []
-        if table.rows:
-            first_row = table.rows[0]
-            for cell in first_row.cells:
-                headers.append(cell.text.lower().strip())
-        
-        # Look for attendance-related keywords
-        attendance_keywords = ['date', 'day', 'time in', 'time out', 'hours', 'attendance']
-        matches = sum(1 for keyword in attendance_keywords if any(keyword in header for header in headers))
-        
-        return matches >= 2  # At least 2 keywords match
+        if not table.rows:
+            return False
+        
+        # Look for attendance-related keywords in the headers, stopping as soon
+        # as two of them have matched
+        matched = set()
+        for cell in table.rows[0].cells:
+            header = _cell_text(cell).lower()
+            for keyword in _ATTENDANCE_KEYWORDS:
+                if keyword not in matched and keyword in header:
+                    matched.add(keyword)
+                    if len(matched) >= 2:
+                        return True  # At least 2 keywords match
+        
+        return False
     
-    def _fill_table_for_date(self, table: Table, current_date, time_in: datetime, time_out: datetime, is_weekend: bool):
+    def _fill_table_for_date(self, table: Table, current_date, time_in: datetime, time_out: datetime, is_weekend: bool,
+                             date_format: str, time_format: str):
         """Fill table for the current date.
         
         Args:
@@ -176,6 +314,8 @@ class WordHandler:
             time_in: Check-in time
             time_out: Check-out time
             is_weekend: Whether current date is weekend
+            date_format: Date format for the date column
+            time_format: Time format for the time columns
         """
         # Find column indices
         header_row = table.rows[0]
@@ -189,7 +329,8 @@ class WordHandler:
         target_row = self._find_or_create_date_row(table, current_date, columns)
         
         if target_row:
-            self._fill_row_data(target_row, columns, current_date, time_in, time_out, is_weekend)
+            self._fill_row_data(target_row, columns, current_date, time_in, time_out, is_weekend,
+                                date_format, time_format)
     
     def _identify_columns(self, header_row) -> Dict[str, int]:
         """Identify column indices based on headers.
@@ -200,38 +341,26 @@ class WordHandler:
         Returns:
             Dictionary mapping column types to indices
         """
+        # Friday check-ins identify the same header row twice; holding the
+        # element keeps the identity check safe from id() reuse
+        if self._columns_cache is not None and self._columns_cache[0] is header_row._tr:
+            return self._columns_cache[1]
+        
         columns = {}
         
         for i, cell in enumerate(header_row.cells):
-            header_text = cell.text.lower().strip()
-            logger.info(f"Column {i}: '{cell.text}' -> '{header_text}'")
-            
-            # Date column
-            if any(keyword in header_text for keyword in ['date', 'dt']):
-                columns['date'] = i
-                logger.info(f"Found date column at index {i}")
-            
-            # Day column
-            elif any(keyword in header_text for keyword in ['day', 'weekday']):
-                columns['day'] = i
-                logger.info(f"Found day column at index {i}")
-            
-            # Time in column - more specific matching
-            elif 'time in' in header_text or header_text in ['time in', 'timein', 'in time', 'intime', 'check in', 'checkin', 'start', 'start time']:
-                columns['time_in'] = i
-                logger.info(f"Found time_in column at index {i}")
-            
-            # Time out column - more specific matching  
-            elif 'time out' in header_text or header_text in ['time out', 'timeout', 'out time', 'outtime', 'check out', 'checkout', 'end', 'end time']:
-                columns['time_out'] = i
-                logger.info(f"Found time_out column at index {i}")
-            
-            # Hours column
-            elif any(keyword in header_text for keyword in ['hours', 'total', 'duration']):
-                columns['hours'] = i
-                logger.info(f"Found hours column at index {i}")
-        
-        logger.info(f"Identified columns: {columns}")
+            cell_text = _cell_text(cell)
+            header_text = cell_text.lower().strip()
+            logger.info("Column %d: '%s' -> '%s'", i, cell_text, header_text)
+            
+            # Date, day, time in, time out or hours column
+            match = _HEADER_RE.match(header_text)
+            if match:
+                columns[match.lastgroup] = i
+                logger.info("Found %s column at index %d", match.lastgroup, i)
+        
+        logger.info("Identified columns: %s", columns)
+        self._columns_cache = (header_row._tr, columns)
         return columns
     
     def _find_or_create_date_row(self, table: Table, target_date, columns) -> Optional[Any]:
@@ -246,46 +375,50 @@ class WordHandler:
             Row to fill or None
         """
         date_col = columns.get('date')
-        day_col = columns.get('day')
-        
-        # First, try to find a row that already has today's date
-        for i, row in enumerate(table.rows[1:], 1):  # Skip header
-            if i < len(table.rows):
-                if date_col is not None:
-                    date_cell = row.cells[date_col]
-                    cell_text = date_cell.text.strip()
-                    
-                    # If cell contains target date, use this row
-                    if self._is_date_match(cell_text, target_date):
-                        logger.info(f"Found existing row for date: {target_date}")
-                        return row
-        
-        # If no existing date found, find the first empty row or a row for today's day of week
-        target_day_name = target_date.strftime('%A')  # Monday, Tuesday, etc.
-        target_date_str = target_date.strftime('%d/%m/%Y')
-        
-        for i, row in enumerate(table.rows[1:], 1):  # Skip header
-            if i < len(table.rows):
+        target_strings = {target_date.strftime(fmt) for fmt in _DATE_FORMATS}
+        
+        # One pass over the body rows: a row that already has today's date wins,
+        # otherwise the first empty row is used
+        first_empty = None
+        for i, row in enumerate(list(table.rows)[1:], 1):  # Skip header
+            cells = row.cells
+            
+            # If cell contains target date, use this row
+            if date_col is not None:
+                cell_text = _cell_text(cells[date_col]).strip()
+                if self._is_date_match(cell_text, target_date, target_strings):
+                    logger.info("Found existing row for date: %s", target_date)
+                    return row
+            
+            if first_empty is None:
                 # Check if this row is empty and can be used
                 is_empty_row = True
-                for j, cell in enumerate(row.cells):
-                    if cell.text.strip() and cell.text.strip() not in ['-', '']:
+                for cell in cells:
+                    text = _cell_text(cell).strip()
+                    if text and text not in _EMPTY_ROW_MARKERS:
                         is_empty_row = False
                         break
-                
                 if is_empty_row:
-                    logger.info(f"Using empty row {i} for date: {target_date}")
-                    return row
+                    first_empty = (i, row)
+                    if date_col is None:
+                        # No date column, so no later row can match
+                        break
         
-        logger.warning(f"No suitable row found for date: {target_date}")
+        if first_empty is not None:
+            i, row = first_empty
+            logger.info("Using empty row %d for date: %s", i, target_date)
+            return row
+        
+        logger.warning("No suitable row found for date: %s", target_date)
         return None
     
-    def _is_date_match(self, cell_text: str, target_date) -> bool:
+    def _is_date_match(self, cell_text: str, target_date, target_strings=None) -> bool:
         """Check if cell text matches target date.
         
         Args:
             cell_text: Text in the cell
             target_date: Date to match
+            target_strings: target_date formatted with each of _DATE_FORMATS (optional)
             
         Returns:
             True if matches
@@ -293,12 +426,19 @@ class WordHandler:
         if not cell_text:
             return False
         
-        # Try different date formats
-        date_formats = ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y']
+        cell_text = cell_text.strip()
+        if target_strings is None:
+            target_strings = {target_date.strftime(fmt) for fmt in _DATE_FORMATS}
+        if cell_text in target_strings:
+            return True
+        # A zero-padded date that is not one of target_strings is another date
+        if _PADDED_DATE_RE.fullmatch(cell_text):
+            return False
         
-        for fmt in date_formats:
+        # Try different date formats, e.g. for days or months written without a leading zero
+        for fmt in _DATE_FORMATS:
             try:
-                parsed_date = datetime.strptime(cell_text.strip(), fmt).date()
+                parsed_date = datetime.strptime(cell_text, fmt).date()
                 if parsed_date == target_date:
                     return True
             except ValueError:
@@ -306,7 +446,8 @@ class WordHandler:
         
         return False
     
-    def _fill_row_data(self, row, columns: Dict[str, int], current_date, time_in: datetime, time_out: datetime, is_weekend: bool):
+    def _fill_row_data(self, row, columns: Dict[str, int], current_date, time_in: datetime, time_out: datetime, is_weekend: bool,
+                       date_format: str, time_format: str):
         """Fill row with attendance data.
         
         Args:
@@ -316,71 +457,76 @@ class WordHandler:
             time_in: Check-in time
             time_out: Check-out time
             is_weekend: Whether it's a weekend
+            date_format: Date format for the date column
+            time_format: Time format for the time columns
         """
-        date_format = self.config.get('date_format', '%d/%m/%Y')
-        time_format = self.config.get('time_format', '%H:%M')
+        cells = row.cells
         
         # Fill date column
         if 'date' in columns:
-            date_cell = row.cells[columns['date']]
+            date_cell = cells[columns['date']]
             if not date_cell.text.strip() or self._is_placeholder(date_cell.text):
-                date_cell.text = current_date.strftime(date_format)
-                logger.info(f"Filled date: {current_date.strftime(date_format)}")
+                date_text = current_date.strftime(date_format)
+                date_cell.text = date_text
+                logger.info("Filled date: %s", date_text)
         
         # Fill day column
         if 'day' in columns:
-            day_cell = row.cells[columns['day']]
+            day_cell = cells[columns['day']]
             if not day_cell.text.strip() or self._is_placeholder(day_cell.text):
-                day_cell.text = calendar.day_name[current_date.weekday()]
-                logger.info(f"Filled day: {calendar.day_name[current_date.weekday()]}")
+                day_name = calendar.day_name[current_date.weekday()]
+                day_cell.text = day_name
+                logger.info("Filled day: %s", day_name)
         
         # Fill time in column
         if 'time_in' in columns:
-            time_in_cell = row.cells[columns['time_in']]
+            time_in_cell = cells[columns['time_in']]
             current_text = time_in_cell.text.strip()
-            logger.info(f"Time In cell current content: '{current_text}'")
+            logger.info("Time In cell current content: '%s'", current_text)
             
             if is_weekend:
-                time_in_cell.text = "Weekend"  # Fill with "Weekend" for weekends
+                self._set_cell_text(time_in_cell, "Weekend")  # Fill with "Weekend" for weekends
                 logger.info("Filled time in with 'Weekend' - weekend")
             elif time_in:
                 # Fill time in if cell is empty or placeholder
                 if not current_text or self._is_placeholder(current_text):
-                    time_in_cell.text = time_in.strftime(time_format)
-                    logger.info(f"Filled time in: {time_in.strftime(time_format)}")
+                    time_in_text = time_in.strftime(time_format)
+                    time_in_cell.text = time_in_text
+                    logger.info("Filled time in: %s", time_in_text)
                 else:
-                    logger.info(f"Time in already filled with: {current_text}")
+                    logger.info("Time in already filled with: %s", current_text)
             else:
                 # If no time_in provided, keep existing value
-                logger.info(f"No time_in provided - keeping existing value: '{current_text}'")
+                logger.info("No time_in provided - keeping existing value: '%s'", current_text)
         else:
             logger.warning("time_in column not found in table")
         
         # Fill time out column
         if 'time_out' in columns:
-            time_out_cell = row.cells[columns['time_out']]
+            time_out_cell = cells[columns['time_out']]
             current_text = time_out_cell.text.strip()
-            logger.info(f"Time Out cell current content: '{current_text}'")
+            logger.info("Time Out cell current content: '%s'", current_text)
             
             if is_weekend:
-                time_out_cell.text = "Weekend"  # Fill with "Weekend" for weekends
+                self._set_cell_text(time_out_cell, "Weekend")  # Fill with "Weekend" for weekends
                 logger.info("Filled time out with 'Weekend' - weekend")
             elif time_out:
                 # Fill time out if cell is empty or placeholder
                 if not current_text or self._is_placeholder(current_text):
-                    time_out_cell.text = time_out.strftime(time_format)
-                    logger.info(f"Filled time out: {time_out.strftime(time_format)}")
+                    time_out_text = time_out.strftime(time_format)
+                    time_out_cell.text = time_out_text
+                    logger.info("Filled time out: %s", time_out_text)
                 else:
-                    logger.info(f"Time out already filled with: {current_text}")
+                    logger.info("Time out already filled with: %s", current_text)
             else:
                 # If no time_out provided, keep existing value
-                logger.info(f"No time_out provided - keeping existing value: '{current_text}'")
+                logger.info("No time_out provided - keeping existing value: '%s'", current_text)
         else:
             logger.warning("time_out column not found in table")
         
         # Calculate and fill hours if we can determine both times
         if 'hours' in columns and not is_weekend:
-            hours_cell = row.cells[columns['hours']]
+            hours_cell = cells[columns['hours']]
             
             # Try to get both times (either from parameters or existing cell values)
             actual_time_in = time_in
@@ -388,23 +534,23 @@ class WordHandler:
             
             # If we don't have time_in from parameter, try to parse it from the cell
             if not actual_time_in and 'time_in' in columns:
-                time_in_text = row.cells[columns['time_in']].text.strip()
+                time_in_text = cells[columns['time_in']].text.strip()
                 if time_in_text and not self._is_placeholder(time_in_text):
                     try:
-                        actual_time_in = datetime.strptime(time_in_text, time_format)
-                        logger.info(f"Parsed existing time_in: {time_in_text}")
+                        actual_time_in = self._parse_time(time_in_text, time_format)
+                        logger.info("Parsed existing time_in: %s", time_in_text)
                     except ValueError:
-                        logger.warning(f"Could not parse existing time_in: {time_in_text}")
+                        logger.warning("Could not parse existing time_in: %s", time_in_text)
             
             # If we don't have time_out from parameter, try to parse it from the cell  
             if not actual_time_out and 'time_out' in columns:
-                time_out_text = row.cells[columns['time_out']].text.strip()
+                time_out_text = cells[columns['time_out']].text.strip()
                 if time_out_text and not self._is_placeholder(time_out_text):
                     try:
-                        actual_time_out = datetime.strptime(time_out_text, time_format)
-                        logger.info(f"Parsed existing time_out: {time_out_text}")
+                        actual_time_out = self._parse_time(time_out_text, time_format)
+                        logger.info("Parsed existing time_out: %s", time_out_text)
                     except ValueError:
-                        logger.warning(f"Could not parse existing time_out: {time_out_text}")
+                        logger.warning("Could not parse existing time_out: %s", time_out_text)
             
             # Calculate hours if we have both times
             if actual_time_in and actual_time_out:
@@ -412,7 +558,7 @@ class WordHandler:
                     duration = actual_time_out - actual_time_in
                     hours = duration.total_seconds() / 3600
                     hours_cell.text = f"{hours:.2f}"
-                    logger.info(f"Calculated hours: {hours:.2f}")
+                    logger.info("Calculated hours: %.2f", hours)
             else:
                 logger.info("Cannot calculate hours - missing time_in or time_out")
     
@@ -425,8 +571,45 @@ class WordHandler:
         Returns:
             True if it's a placeholder
         """
-        placeholders = ['', '-', '--', 'N/A', 'TBD', 'TIME', 'DATE', 'DAY', 'HH:MM', 'DD/MM/YYYY']
-        return text.strip().upper() in [p.upper() for p in placeholders]
+        return text.strip().upper() in _PLACEHOLDERS
+    
+    def _parse_time(self, text: str, time_format: str) -> datetime:
+        """Parse a time cell the way datetime.strptime does.
+        
+        Plain H:MM / HH:MM text in the default '%H:%M' format is parsed by hand;
+        anything else goes through strptime.
+        
+        Args:
+            text: Stripped cell text
+            time_format: Configured time format
+            
+        Returns:
+            Parsed time on 1900-01-01, as strptime returns it
+            
+        Raises:
+            ValueError: If the text does not match the format
+        """
+        if time_format == '%H:%M':
+            hour, sep, minute = text.partition(':')
+            if (sep and 0 < len(hour) <= 2 and 0 < len(minute) <= 2
+                    and (hour + minute).isascii() and (hour + minute).isdigit()):
+                hour, minute = int(hour), int(minute)
+                if hour < 24 and minute < 60:
+                    return datetime(1900, 1, 1, hour, minute)
+        return datetime.strptime(text, time_format)
+    
+    def _set_cell_text(self, cell: _Cell, text: str):
+        """Set a cell's text unless it already holds exactly that text.
+        
+        Assigning cell.text rebuilds the cell's paragraphs and runs, so this
+        leaves cells that are already correct untouched.
+        
+        Args:
+            cell: Table cell to write
+            text: New cell text
+        """
+        if cell.text != text:
+            cell.text = text
     
     def _generate_output_path(self, input_path: str) -> str:
         """Generate output path for filled document.
@@ -439,26 +622,26 @@ class WordHandler:
         """
         input_file = Path(input_path)
         output_dir = Path(self.config.get('output_directory', 'filled_docs'))
-        # Only create output_dir if/when a file is actually written
-
-        if not output_dir.exists():
+        # Only create output_dir if/when a file is actually written, and only
+        # check for it the first time
+        output_key = str(output_dir)
+        if output_key not in self._output_dirs_ready:
             output_dir.mkdir(parents=True, exist_ok=True)
+            self._output_dirs_ready.add(output_key)
 
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"{input_file.stem}_filled_{timestamp}{input_file.suffix}"
 
         return str(output_dir / filename)
     
-    def _fill_weekend_days(self, table: Table, friday_date):
+    def _fill_weekend_days(self, table: Table, friday_date, date_format: str):
         """Fill Saturday and Sunday rows automatically when checking in on Friday.
         
         Args:
             table: Attendance table
             friday_date: The Friday date
+            date_format: Date format for the date column
         """
-        from datetime import timedelta
-        from docx.shared import RGBColor
-        
         logger.info("Auto-filling weekend days for Friday check-in")
         
         # Calculate Saturday and Sunday dates
@@ -473,47 +656,54 @@ class WordHandler:
             logger.warning("Could not identify columns for weekend filling")
             return
         
+        # Find the Saturday and Sunday rows in one scan
+        empty_rows = self._find_next_empty_rows(table, columns, 2)
+        saturday_row = empty_rows[0] if empty_rows else None
+        sunday_row = empty_rows[1] if len(empty_rows) > 1 else None
+        
         # Fill Saturday
-        saturday_row = self._find_next_empty_row(table, columns)
         if saturday_row:
-            self._fill_weekend_row(saturday_row, columns, saturday_date, "Saturday")
+            self._fill_weekend_row(saturday_row, columns, saturday_date, "Saturday", date_format)
             self._highlight_weekend_row(saturday_row)
             logger.info(f"Filled Saturday row: {saturday_date}")
         
         # Fill Sunday  
-        sunday_row = self._find_next_empty_row(table, columns)
         if sunday_row:
-            self._fill_weekend_row(sunday_row, columns, sunday_date, "Sunday")
+            self._fill_weekend_row(sunday_row, columns, sunday_date, "Sunday", date_format)
             self._highlight_weekend_row(sunday_row)
             logger.info(f"Filled Sunday row: {sunday_date}")
     
-    def _find_next_empty_row(self, table: Table, columns):
-        """Find the next empty row in the table.
+    def _find_next_empty_rows(self, table: Table, columns, count: int) -> List[Any]:
+        """Find the next empty rows in the table.
         
         Args:
             table: Attendance table
             columns: Column mapping
+            count: Maximum number of rows to return
             
         Returns:
-            Next empty row or None
+            Up to count empty rows in table order, empty if there are none
         """
-        for i, row in enumerate(table.rows[1:], 1):  # Skip header
-            if i < len(table.rows):
-                # Check if this row is empty and can be used
-                is_empty_row = True
-                for j, cell in enumerate(row.cells):
-                    if cell.text.strip() and cell.text.strip() not in ['-', '', 'N/A']:
-                        is_empty_row = False
-                        break
-                
-                if is_empty_row:
-                    logger.info(f"Found next empty row at index {i}")
-                    return row
+        empty_rows = []
+        for i, row in enumerate(list(table.rows)[1:], 1):  # Skip header
+            # Check if this row is empty and can be used
+            is_empty_row = True
+            for cell in row.cells:
+                text = _cell_text(cell).strip()
+                if text and text not in _EMPTY_WEEKEND_ROW_MARKERS:
+                    is_empty_row = False
+                    break
+            
+            if is_empty_row:
+                logger.info(f"Found next empty row at index {i}")
+                empty_rows.append(row)
+                if len(empty_rows) == count:
+                    return empty_rows
         
         logger.warning("No empty rows found for weekend filling")
-        return None
+        return empty_rows
     
-    def _fill_weekend_row(self, row, columns: Dict[str, int], date, day_name: str):
+    def _fill_weekend_row(self, row, columns: Dict[str, int], date, day_name: str, date_format: str):
         """Fill a weekend row with date and day, leaving time columns empty.
         
         Args:
@@ -521,33 +711,34 @@ class WordHandler:
             columns: Column mapping
             date: Weekend date
             day_name: Day name (Saturday/Sunday)
+            date_format: Date format for the date column
         """
-        date_format = self.config.get('date_format', '%d/%m/%Y')
+        cells = row.cells
         
         # Fill date column
         if 'date' in columns:
-            date_cell = row.cells[columns['date']]
+            date_cell = cells[columns['date']]
             if not date_cell.text.strip() or self._is_placeholder(date_cell.text):
                 date_cell.text = date.strftime(date_format)
         
         # Fill day column
         if 'day' in columns:
-            day_cell = row.cells[columns['day']]
+            day_cell = cells[columns['day']]
             if not day_cell.text.strip() or self._is_placeholder(day_cell.text):
                 day_cell.text = day_name
         
         # Fill time columns with "Weekend" for weekend days
         if 'time_in' in columns:
-            time_in_cell = row.cells[columns['time_in']]
-            time_in_cell.text = "Weekend"
+            time_in_cell = cells[columns['time_in']]
+            self._set_cell_text(time_in_cell, "Weekend")
         
         if 'time_out' in columns:
-            time_out_cell = row.cells[columns['time_out']]
-            time_out_cell.text = "Weekend"
+            time_out_cell = cells[columns['time_out']]
+            self._set_cell_text(time_out_cell, "Weekend")
         
         if 'hours' in columns:
-            hours_cell = row.cells[columns['hours']]
-            hours_cell.text = ""
+            hours_cell = cells[columns['hours']]
+            self._set_cell_text(hours_cell, "")
     
     def _highlight_weekend_row(self, row):
         """Highlight a weekend row with gray background.
@@ -556,18 +747,9 @@ class WordHandler:
             row: Table row to highlight
         """
         try:
-            from docx.shared import RGBColor
-            from docx.oxml import parse_xml
-            from docx.oxml.ns import nsdecls
-            
-            # Light gray color (RGB: 220, 220, 220)
-            gray_color = "DCDCDC"
-            
             for cell in row.cells:
                 # Set cell background color
-                cell_properties = cell._tc.get_or_add_tcPr()
-                shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="{gray_color}"/>')
-                cell_properties.append(shading)
+                cell._tc.get_or_add_tcPr().append(deepcopy(_WEEKEND_SHADING))
                 
             logger.info("Applied gray highlighting to weekend row")
             
@@ -580,7 +762,7 @@ class WordHandler:
         Returns:
             List of template file paths
         """
-        templates = []
-        for ext in ['.docx', '.doc']:
-            templates.extend(Path('.').glob(f'*{ext}'))
-        return [str(t) for t in templates]
+        with os.scandir('.') as entries:
+            return [entry.name for entry in entries
+                    if entry.name.lower().endswith(('.docx', '.doc'))
+                    and entry.is_file(follow_symlinks=False)]